@@ -0,0 +1,394 @@
+"""
+Local stand-in for the Notion API, serving a synthetic workspace.
+
+Run it on its own and point the server at it with NOTION_BASE_URL:
+
+    python -m benchmarks.fake_notion --port 8765
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+CREATED = "2024-01-01T00:00:00.000Z"
+
+
+def _rich_text(text: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": "text",
+            "text": {"content": text, "link": None},
+            "annotations": {"bold": False, "italic": False, "code": False, "color": "default"},
+            "plain_text": text,
+            "href": None,
+        }
+    ]
+
+
+class Workspace:
+    """A synthetic Notion workspace held in memory."""
+
+    def __init__(self, seed: int = 0):
+        """Initialize an empty workspace."""
+        self.random = random.Random(seed)
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.rows: Dict[str, List[Dict[str, Any]]] = {}
+        self.children: Dict[str, List[Dict[str, Any]]] = {}
+        self._next_id = 0
+
+    def new_id(self) -> str:
+        """Return a new UUID-shaped ID."""
+        self._next_id += 1
+        return f"00000000-0000-4000-8000-{self._next_id:012d}"
+
+    def _page(
+        self, title: str, parent: Dict[str, Any], properties: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        page_id = self.new_id()
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": CREATED,
+            "last_edited_time": CREATED,
+            "archived": False,
+            "parent": parent,
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+            "properties": properties or {"title": {"id": "title", "type": "title", "title": _rich_text(title)}},
+        }
+        self.pages[page_id] = page
+        self.children[page_id] = []
+        return page
+
+    def _block(self, parent_id: str, block_type: str, text: str) -> Dict[str, Any]:
+        block = {
+            "object": "block",
+            "id": self.new_id(),
+            "parent": {"type": "block_id", "block_id": parent_id},
+            "created_time": CREATED,
+            "last_edited_time": CREATED,
+            "has_children": False,
+            "archived": False,
+            "type": block_type,
+            block_type: {"rich_text": _rich_text(text), "color": "default"},
+        }
+        self.children[parent_id].append(block)
+        self.children[block["id"]] = []
+        return block
+
+    def add_page(self, title: str, depth: int = 1, width: int = 10) -> str:
+        """Add a page whose block tree is ``depth`` levels deep and ``width`` blocks wide."""
+        page = self._page(title, {"type": "workspace", "workspace": True})
+        self._fill(page["id"], depth, width)
+        return page["id"]
+
+    def _fill(self, parent_id: str, depth: int, width: int) -> None:
+        block_types = ("paragraph", "bulleted_list_item", "heading_2", "to_do", "toggle", "quote")
+        for i in range(width):
+            block_type = block_types[self.random.randrange(len(block_types))]
+            text = f"Block {i} " + " ".join(
+                self.random.choice(("alpha", "beta", "gamma", "delta", "notion", "roadmap", "metrics"))
+                for _ in range(8)
+            )
+            block = self._block(parent_id, block_type, text)
+            if depth > 1:
+                block["has_children"] = True
+                self._fill(block["id"], depth - 1, width)
+
+    def add_page_tree(self, title: str, levels: int, fanout: int, width: int = 5) -> str:
+        """Add a page with ``fanout`` child pages per page, ``levels`` pages deep."""
+        page = self._page(title, {"type": "workspace", "workspace": True})
+        self._fill_tree(page["id"], levels - 1, fanout, width)
+        return page["id"]
+
+    def _fill_tree(self, page_id: str, levels: int, fanout: int, width: int) -> None:
+        self._fill(page_id, 1, width)
+        if not levels:
+            return
+        for i in range(fanout):
+            child = self._page(f"Section {i}", {"type": "page_id", "page_id": page_id})
+            # A child_page block shares its page's ID and lists the page's blocks as children
+            self.children[page_id].append(
+                {
+                    "object": "block",
+                    "id": child["id"],
+                    "parent": {"type": "page_id", "page_id": page_id},
+                    "created_time": CREATED,
+                    "last_edited_time": CREATED,
+                    "has_children": True,
+                    "archived": False,
+                    "type": "child_page",
+                    "child_page": {"title": f"Section {i}"},
+                }
+            )
+            self._fill_tree(child["id"], levels - 1, fanout, width)
+
+    def add_database(self, title: str, rows: int, related: Optional[List[str]] = None) -> str:
+        """Add a database with ``rows`` pages carrying several property types.
+
+        With ``related`` page IDs, every row also has a ``Project`` relation to
+        two of those pages.
+        """
+        database_id = self.new_id()
+        self.databases[database_id] = {
+            "object": "database",
+            "id": database_id,
+            "created_time": CREATED,
+            "last_edited_time": CREATED,
+            "title": _rich_text(title),
+            "url": f"https://www.notion.so/{database_id.replace('-', '')}",
+            "properties": {
+                "Name": {"id": "title", "type": "title", "title": {}},
+                "Status": {"id": "s", "type": "select", "select": {"options": []}},
+                "Points": {"id": "p", "type": "number", "number": {}},
+                "Done": {"id": "d", "type": "checkbox", "checkbox": {}},
+                "Due": {"id": "u", "type": "date", "date": {}},
+            },
+        }
+        if related:
+            self.databases[database_id]["properties"]["Project"] = {"id": "r", "type": "relation", "relation": {}}
+        parent = {"type": "database_id", "database_id": database_id}
+        statuses = ("Todo", "In progress", "Done")
+        self.rows[database_id] = []
+        for i in range(rows):
+            properties = {
+                "Name": {"id": "title", "type": "title", "title": _rich_text(f"Row {i}")},
+                "Status": {"id": "s", "type": "select", "select": {"name": statuses[i % 3]}},
+                "Points": {"id": "p", "type": "number", "number": i % 13},
+                "Done": {"id": "d", "type": "checkbox", "checkbox": i % 3 == 2},
+                "Due": {"id": "u", "type": "date", "date": {"start": f"2024-{i % 12 + 1:02d}-01"}},
+            }
+            if related:
+                projects = [related[i % len(related)], related[(i * 7 + 3) % len(related)]]
+                properties["Project"] = {
+                    "id": "r",
+                    "type": "relation",
+                    "relation": [{"id": page_id} for page_id in dict.fromkeys(projects)],
+                    "has_more": False,
+                }
+            self.rows[database_id].append(self._page(f"Row {i}", parent, properties))
+        return database_id
+
+
+class FakeNotion:
+    """ASGI app answering the Notion endpoints the server uses from a ``Workspace``.
+
+    Every request waits ``latency`` seconds (plus up to ``jitter``). Requests
+    above ``rate_limit`` per second, and a random ``error_rate`` fraction of
+    the others, get a 429 with a ``Retry-After`` header.
+    """
+
+    def __init__(
+        self,
+        workspace: Workspace,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: Optional[float] = None,
+        error_rate: float = 0.0,
+        retry_after: float = 0.1,
+        seed: int = 0,
+    ):
+        """Initialize the fake API."""
+        self.workspace = workspace
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.rate_limited = 0
+        self._tokens = rate_limit or 0.0
+        self._updated = time.monotonic()
+        self.app = Starlette(
+            routes=[
+                Route("/v1/search", self.search, methods=["POST"]),
+                Route("/v1/pages/{page_id}", self.retrieve_page, methods=["GET"]),
+                Route("/v1/blocks/{block_id}/children", self.list_children, methods=["GET"]),
+                Route("/v1/databases/{database_id}/query", self.query_database, methods=["POST"]),
+                Route("/v1/databases/{database_id}", self.retrieve_database, methods=["GET"]),
+            ]
+        )
+
+    def reset_counters(self) -> None:
+        """Zero the request counters."""
+        self.requests = 0
+        self.rate_limited = 0
+
+    async def _admit(self) -> Optional[JSONResponse]:
+        """Apply latency and rate limiting; return a 429 response if the request is rejected."""
+        self.requests += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+
+        limited = self.error_rate and self.random.random() < self.error_rate
+        if self.rate_limit:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens < 1:
+                limited = True
+            else:
+                self._tokens -= 1
+
+        if limited:
+            self.rate_limited += 1
+            return _error(429, "rate_limited", "Rate limited", {"Retry-After": str(self.retry_after)})
+        return None
+
+    async def search(self, request: Request) -> JSONResponse:
+        rejected = await self._admit()
+        if rejected:
+            return rejected
+        body = await request.json()
+        query = (body.get("query") or "").lower()
+        object_type = (body.get("filter") or {}).get("value")
+
+        results: List[Dict[str, Any]] = []
+        if object_type in (None, "page"):
+            results.extend(
+                page for page in self.workspace.pages.values()
+                if page["parent"]["type"] == "workspace" and query in _title(page).lower()
+            )
+        if object_type in (None, "database"):
+            results.extend(
+                database for database in self.workspace.databases.values()
+                if query in database["title"][0]["plain_text"].lower()
+            )
+        return _paginated(results, body.get("start_cursor"), body.get("page_size"))
+
+    async def retrieve_page(self, request: Request) -> JSONResponse:
+        rejected = await self._admit()
+        if rejected:
+            return rejected
+        page = self.workspace.pages.get(request.path_params["page_id"])
+        if page is None:
+            return _error(404, "object_not_found", "Could not find page")
+        return JSONResponse(page)
+
+    async def list_children(self, request: Request) -> JSONResponse:
+        rejected = await self._admit()
+        if rejected:
+            return rejected
+        children = self.workspace.children.get(request.path_params["block_id"])
+        if children is None:
+            return _error(404, "object_not_found", "Could not find block")
+        params = request.query_params
+        return _paginated(children, params.get("start_cursor"), params.get("page_size"))
+
+    async def query_database(self, request: Request) -> JSONResponse:
+        rejected = await self._admit()
+        if rejected:
+            return rejected
+        rows = self.workspace.rows.get(request.path_params["database_id"])
+        if rows is None:
+            return _error(404, "object_not_found", "Could not find database")
+        body = await request.json()
+        for sort in reversed(body.get("sorts") or []):
+            # Only timestamp sorts are supported
+            if sort.get("timestamp") in ("created_time", "last_edited_time"):
+                rows = sorted(rows, key=lambda row: row[sort["timestamp"]], reverse=sort.get("direction") == "descending")
+        return _paginated(rows, body.get("start_cursor"), body.get("page_size"))
+
+    async def retrieve_database(self, request: Request) -> JSONResponse:
+        rejected = await self._admit()
+        if rejected:
+            return rejected
+        database = self.workspace.databases.get(request.path_params["database_id"])
+        if database is None:
+            return _error(404, "object_not_found", "Could not find database")
+        return JSONResponse(database)
+
+
+def _title(page: Dict[str, Any]) -> str:
+    for prop in page["properties"].values():
+        if prop["type"] == "title":
+            return "".join(text["plain_text"] for text in prop["title"])
+    return ""
+
+
+def _paginated(results: List[Dict[str, Any]], cursor: Optional[str], page_size: Any) -> JSONResponse:
+    """Return one page of ``results``; cursors are plain offsets."""
+    start = int(cursor or 0)
+    end = start + min(int(page_size or 100), 100)
+    has_more = end < len(results)
+    return JSONResponse(
+        {
+            "object": "list",
+            "results": results[start:end],
+            "has_more": has_more,
+            "next_cursor": str(end) if has_more else None,
+        }
+    )
+
+
+def _error(
+    status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    return JSONResponse(
+        {"object": "error", "status": status, "code": code, "message": message},
+        status_code=status,
+        headers=headers,
+    )
+
+
+def serve_in_thread(fake: FakeNotion, port: int = 0) -> Tuple[str, uvicorn.Server]:
+    """Serve the fake API from a background thread; return its base URL and server."""
+    config = uvicorn.Config(fake.app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    return f"http://127.0.0.1:{bound_port}", server
+
+
+def build_workspace(seed: int = 0) -> Tuple[Workspace, Dict[str, Any]]:
+    """Build the standard benchmark workspace; return it with the IDs of its fixtures."""
+    workspace = Workspace(seed)
+    fixtures = {
+        "deep_page": workspace.add_page("Deep page", depth=4, width=8),
+        "wide_page": workspace.add_page("Wide page", depth=1, width=1000),
+        "small_pages": [workspace.add_page(f"Note {i}", depth=2, width=5) for i in range(20)],
+        "wide_database": workspace.add_database("Tasks", rows=2000),
+        "page_tree": workspace.add_page_tree("Handbook", levels=4, fanout=5),
+    }
+    fixtures["related_database"] = workspace.add_database("Tickets", rows=500, related=fixtures["small_pages"])
+    # Pad the workspace so page listings paginate over 10k results
+    for i in range(10_000 - 3 - len(fixtures["small_pages"])):
+        workspace.add_page(f"Archive {i}", depth=1, width=0)
+    return workspace, fixtures
+
+
+def main() -> None:
+    """Serve the standard benchmark workspace."""
+    parser = argparse.ArgumentParser(description="Fake Notion API for offline testing")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Maximum random extra latency")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    workspace, fixtures = build_workspace()
+    fake = FakeNotion(workspace, args.latency, args.jitter, args.rate_limit, args.error_rate)
+    print(
+        f"Fixtures: {fixtures['deep_page']} (deep page), {fixtures['page_tree']} (page tree), "
+        f"{fixtures['wide_database']} (database)"
+    )
+    uvicorn.run(fake.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Memory benchmark of the in-memory block and page representations.
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --max-bytes-per-block 400
+
+Builds the standard benchmark workspace and measures, with ``tracemalloc``,
+the memory retained by:
+
+- ``blocks``: the block tree of the deep page (about 4,700 blocks), as raw
+  API dicts (how block trees were held before) and as ``Block`` records
+- ``pages``: the 2,000 rows of the benchmark database, as raw page objects
+  and as ``Page`` records
+- ``stored``: the JSON written to the page store for the same block tree
+
+Raw objects are decoded from JSON, as the Notion client does, so nothing is
+shared with the fake workspace. With ``--max-bytes-per-block`` the run fails
+(exit code 1) when a ``Block`` record takes more.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.fake_notion import Workspace, build_workspace
+from src.tools.models import Page, blocks_from_api
+
+
+def _decoded(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a fresh copy of an API object, as decoded from a response."""
+    return json.loads(json.dumps(obj))
+
+
+def raw_tree(workspace: Workspace, block_id: str) -> List[Dict[str, Any]]:
+    """Return a block tree as raw dicts with ``children`` attached."""
+    blocks = []
+    for block in workspace.children.get(block_id, []):
+        block = _decoded(block)
+        if block["has_children"]:
+            block["children"] = raw_tree(workspace, block["id"])
+        blocks.append(block)
+    return blocks
+
+
+def count(blocks: List[Dict[str, Any]]) -> int:
+    """Count the blocks of a raw tree."""
+    return sum(1 + count(block.get("children", [])) for block in blocks)
+
+
+def retained(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Return the value built by ``build`` and the bytes it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+def measure(workspace: Workspace, fixtures: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Measure the raw and compact representations; sizes are bytes per item."""
+    deep_page = fixtures["deep_page"]
+    raw_blocks, raw_size = retained(lambda: raw_tree(workspace, deep_page))
+    blocks = count(raw_blocks)
+    del raw_blocks
+    model_blocks, model_size = retained(lambda: blocks_from_api(raw_tree(workspace, deep_page)))
+
+    rows = workspace.rows[fixtures["wide_database"]]
+    raw_pages, raw_pages_size = retained(lambda: [_decoded(page) for page in rows])
+    del raw_pages
+    model_pages, model_pages_size = retained(lambda: [Page.from_api(_decoded(page)) for page in rows])
+
+    stored_raw = len(json.dumps(raw_tree(workspace, deep_page)))
+    stored_model = len(json.dumps([block.to_row() for block in model_blocks], separators=(",", ":")))
+
+    return {
+        "blocks": {"items": blocks, "raw": raw_size / blocks, "model": model_size / blocks},
+        "pages": {"items": len(rows), "raw": raw_pages_size / len(rows), "model": model_pages_size / len(model_pages)},
+        "stored": {"items": blocks, "raw": stored_raw / blocks, "model": stored_model / blocks},
+    }
+
+
+def main() -> None:
+    """Run the memory benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Memory benchmark of the block and page representations")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--max-bytes-per-block", type=float, help="Fail when a Block record takes more")
+    args = parser.parse_args()
+
+    results = measure(*build_workspace())
+
+    print(f"{'measure':<10}{'items':>8}{'raw B/item':>12}{'model B/item':>14}{'saved':>8}")
+    for name, values in results.items():
+        saved = 1 - values["model"] / values["raw"]
+        print(f"{name:<10}{values['items']:>8}{values['raw']:>12.0f}{values['model']:>14.0f}{saved:>8.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_bytes_per_block is not None and results["blocks"]["model"] > args.max_bytes_per_block:
+        print(f"REGRESSION {results['blocks']['model']:.0f} bytes/block > {args.max_bytes_per_block:.0f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Offline benchmarks of the Notion tools and the MCP server against a fake Notion API.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scenario page_deep_cold --latency 0.05
+    python -m benchmarks.run --json results.json
+    python -m benchmarks.run --baseline results.json --tolerance 0.25
+
+With ``--baseline``, the run fails (exit code 1) when a scenario's p50
+latency regresses by more than the tolerance or it makes more Notion
+requests per call than in the baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from mcp import types
+
+from benchmarks.fake_notion import FakeNotion, build_workspace, serve_in_thread
+from src.config import settings
+
+
+class Scenario:
+    """A tool call repeated ``calls`` times, ``concurrency`` at a time."""
+
+    def __init__(
+        self,
+        name: str,
+        call: Callable[["Bench"], Awaitable[Any]],
+        calls: int,
+        concurrency: int = 1,
+        cold: bool = True,
+        error_rate: float = 0.0,
+    ):
+        """Define a scenario; ``cold`` clears the response cache before every call."""
+        self.name = name
+        self.call = call
+        self.calls = calls
+        self.concurrency = concurrency
+        self.cold = cold
+        self.error_rate = error_rate
+
+
+class Bench:
+    """The fake API, tools and server shared by all scenarios."""
+
+    def __init__(self, fake: FakeNotion, fixtures: Dict[str, Any]):
+        """Create the tools and server against the running fake API."""
+        # Imported here so they pick up the settings pointing at the fake API
+        from src.server import MCPServer
+
+        self.fake = fake
+        self.fixtures = fixtures
+        self.server = MCPServer()
+        self.tools = self.server.notion_tools
+        self._call_tool = self.server.app.request_handlers[types.CallToolRequest]
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> str:
+        """Call a tool through the MCP server's request handler."""
+        request = types.CallToolRequest(
+            method="tools/call", params=types.CallToolRequestParams(name=name, arguments=arguments)
+        )
+        result = (await self._call_tool(request)).root
+        if result.isError:
+            raise RuntimeError(result.content[0].text)
+        return result.content[0].text
+
+
+SCENARIOS = [
+    Scenario("page_deep_cold", lambda b: b.tools.get_page_content(b.fixtures["deep_page"]), calls=3),
+    Scenario(
+        "page_deep_warm",
+        lambda b: b.tools.get_page_content(b.fixtures["deep_page"]),
+        calls=200,
+        concurrency=8,
+        cold=False,
+    ),
+    Scenario("page_wide_cold", lambda b: b.tools.get_page_content(b.fixtures["wide_page"]), calls=5),
+    Scenario(
+        "database_2000_rows",
+        lambda b: b.tools.get_database_pages(b.fixtures["wide_database"], limit=2000),
+        calls=3,
+    ),
+    Scenario(
+        "database_relations",
+        lambda b: b.tools.get_database_pages(
+            b.fixtures["related_database"], limit=500, fields=["Name", "Project"], resolve_relations=True
+        ),
+        calls=3,
+    ),
+    Scenario(
+        "aggregate_2000_rows",
+        lambda b: b.tools.aggregate_database(b.fixtures["wide_database"], group_by="Status", sum_fields=["Points"]),
+        calls=3,
+    ),
+    Scenario("list_pages_10k", lambda b: b.tools.get_notion_pages(limit=10_000), calls=2),
+    Scenario("search", lambda b: b.tools.search_notion("note", limit=20), calls=20),
+    Scenario("batch_20_pages", lambda b: b.tools.get_batch(page_ids=b.fixtures["small_pages"]), calls=3),
+    Scenario(
+        "server_page_warm",
+        lambda b: b.call_tool("get_page_content", {"page_id": b.fixtures["small_pages"][0]}),
+        calls=500,
+        concurrency=4,
+        cold=False,
+    ),
+    Scenario(
+        "page_with_429s",
+        lambda b: b.tools.get_page_content(b.fixtures["small_pages"][1]),
+        calls=5,
+        error_rate=0.2,
+    ),
+]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Return the ``q`` quantile of sorted values (nearest rank)."""
+    index = min(len(values) - 1, max(0, int(round(q * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+async def run_scenario(bench: Bench, scenario: Scenario) -> Dict[str, Any]:
+    """Run a scenario and summarize its latencies and Notion traffic."""
+    fake = bench.fake
+    if not scenario.cold:
+        # Warm the cache outside the measurement
+        await scenario.call(bench)
+    fake.reset_counters()
+    fake.error_rate = scenario.error_rate
+    retries_before = bench.tools.limiter.retries
+
+    latencies: List[float] = []
+    pending = iter(range(scenario.calls))
+
+    async def worker() -> None:
+        for _ in pending:
+            if scenario.cold:
+                bench.tools.cache.clear()
+            started = time.perf_counter()
+            await scenario.call(bench)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    elapsed = time.perf_counter() - started
+    fake.error_rate = 0.0
+
+    latencies.sort()
+    return {
+        "calls": scenario.calls,
+        "throughput": scenario.calls / elapsed,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "requests_per_call": fake.requests / scenario.calls,
+        "rate_limited": fake.rate_limited,
+        "retries": bench.tools.limiter.retries - retries_before,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Return the regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {result['p50_ms']:.1f}ms vs {base['p50_ms']:.1f}ms")
+        # Injected 429s cause retries, so request counts only compare without them
+        if not result["rate_limited"] and result["requests_per_call"] > base["requests_per_call"]:
+            regressions.append(
+                f"{name}: {result['requests_per_call']:.1f} requests/call vs {base['requests_per_call']:.1f}"
+            )
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    """Print a results table."""
+    print(
+        f"{'scenario':<22}{'calls':>7}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'req/call':>10}{'429s':>6}{'retries':>9}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<22}{r['calls']:>7}{r['throughput']:>10.1f}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+            f"{r['requests_per_call']:>10.1f}{r['rate_limited']:>6}{r['retries']:>9}"
+        )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Start the fake API, run the selected scenarios and return their results."""
+    workspace, fixtures = build_workspace()
+    fake = FakeNotion(workspace, latency=args.latency, jitter=args.jitter, retry_after=0.05)
+    base_url, fake_server = serve_in_thread(fake)
+
+    settings.notion_api_key = "secret_benchmark"
+    settings.notion_base_url = base_url
+    settings.page_store_path = None
+    settings.sync_enabled = False
+    # Measure the server, not the client-side throttle; 429s are still retried
+    settings.rate_limit_per_second = args.rate_limit
+    settings.rate_limit_burst = max(1, int(args.rate_limit))
+    settings.retry_base_delay = 0.01
+
+    bench = Bench(fake, fixtures)
+    results = {}
+    try:
+        for scenario in SCENARIOS:
+            if args.scenario and scenario.name not in args.scenario:
+                continue
+            results[scenario.name] = await run_scenario(bench, scenario)
+    finally:
+        from src.tools.client import close_notion_client
+
+        await bench.tools.close()
+        await close_notion_client()
+        fake_server.should_exit = True
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="Offline benchmarks against a fake Notion API")
+    parser.add_argument("--scenario", action="append", help="Run only this scenario (repeatable)")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds the fake API adds to every request")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Maximum random extra latency")
+    parser.add_argument("--rate-limit", type=float, default=1000.0, help="Client-side requests per second")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Fail on regressions against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 regression (default: 0.25)")
+    args = parser.parse_args()
+
+    # Retries of injected 429s are logged as warnings
+    logging.basicConfig(level=logging.ERROR)
+    results = asyncio.run(run(args))
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
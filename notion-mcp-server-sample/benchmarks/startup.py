@@ -0,0 +1,161 @@
+"""
+Cold start benchmark of the stdio server.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 --max-handshake-ms 100
+
+Each run starts ``python -m src.main`` as an MCP client would and measures:
+
+- ``ping``: from process start to the first response (imports and setup)
+- ``cold``: from process start to the ``tools/list`` response, with the
+  ``initialize`` handshake sent right away
+- ``handshake``: ``initialize`` + ``tools/list`` on a started server
+
+No Notion request is made. With ``--max-handshake-ms`` the run fails (exit
+code 1) when the median handshake is slower.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, IO, List
+
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "1.0"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+PING = {"jsonrpc": "2.0", "id": 0, "method": "ping"}
+
+
+def _send(stdin: IO[bytes], *messages: Dict[str, Any]) -> None:
+    """Write newline-delimited JSON-RPC messages."""
+    stdin.write(b"".join(json.dumps(message).encode() + b"\n" for message in messages))
+    stdin.flush()
+
+
+def _wait_for(stdout: IO[bytes], request_id: int) -> Dict[str, Any]:
+    """Read messages until the response to ``request_id``."""
+    while True:
+        line = stdout.readline()
+        if not line:
+            raise RuntimeError("Server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"Server returned an error: {message['error']}")
+            return message
+
+
+def _start() -> subprocess.Popen:
+    """Start the stdio server with a dummy API key and no local mirror."""
+    env = dict(
+        os.environ,
+        NOTION_API_KEY="secret_startup_benchmark",
+        PAGE_STORE_PATH="",
+        SYNC_ENABLED="false",
+        TRANSPORT="stdio",
+        LOG_LEVEL="WARNING",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "src.main"],
+        cwd=PROJECT_DIR,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _stop(process: subprocess.Popen) -> None:
+    """Close the server's stdin and wait for it to exit."""
+    process.stdin.close()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_once() -> Dict[str, float]:
+    """Time one server start, in milliseconds."""
+    started = time.perf_counter()
+    process = _start()
+    try:
+        _send(process.stdin, INITIALIZE, INITIALIZED, LIST_TOOLS)
+        _wait_for(process.stdout, 2)
+        cold = time.perf_counter() - started
+    finally:
+        _stop(process)
+
+    started = time.perf_counter()
+    process = _start()
+    try:
+        _send(process.stdin, PING)
+        _wait_for(process.stdout, 0)
+        ping = time.perf_counter() - started
+
+        handshake_started = time.perf_counter()
+        _send(process.stdin, INITIALIZE, INITIALIZED, LIST_TOOLS)
+        response = _wait_for(process.stdout, 2)
+        handshake = time.perf_counter() - handshake_started
+    finally:
+        _stop(process)
+
+    if not response["result"]["tools"]:
+        raise RuntimeError("Server listed no tools")
+    return {"ping_ms": ping * 1000, "cold_ms": cold * 1000, "handshake_ms": handshake * 1000}
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Return the median and maximum of each timing."""
+    return {
+        name: {
+            "median": statistics.median(run[name] for run in runs),
+            "max": max(run[name] for run in runs),
+        }
+        for name in runs[0]
+    }
+
+
+def main() -> None:
+    """Run the startup benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Cold start benchmark of the stdio server")
+    parser.add_argument("--runs", type=int, default=5, help="Number of server starts (default: 5)")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--max-handshake-ms", type=float, help="Fail when the median handshake is slower")
+    args = parser.parse_args()
+
+    # The first start may compile bytecode; it is not measured
+    run_once()
+    summary = summarize([run_once() for _ in range(args.runs)])
+
+    print(f"{'timing':<16}{'median ms':>12}{'max ms':>10}")
+    for name, values in summary.items():
+        print(f"{name[:-3]:<16}{values['median']:>12.1f}{values['max']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    if args.max_handshake_ms is not None and summary["handshake_ms"]["median"] > args.max_handshake_ms:
+        print(f"REGRESSION handshake {summary['handshake_ms']['median']:.1f}ms > {args.max_handshake_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 Configuration management for the MCP server.
 """
 
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -14,6 +14,20 @@ class Settings(BaseSettings):
     server_name: str = Field(default="Notion MCP Server", description="Name of the MCP server")
     server_version: str = Field(default="0.1.0", description="Version of the MCP server")
     
+    # Transport settings
+    transport: Literal["stdio", "http"] = Field(
+        default="stdio", description="MCP transport: 'stdio' or 'http' (streamable HTTP, shared by many clients)"
+    )
+    http_host: str = Field(default="127.0.0.1", description="Interface the HTTP transport listens on")
+    http_port: int = Field(default=8000, description="Port the HTTP transport listens on")
+    http_path: str = Field(default="/mcp", description="URL path of the MCP endpoint")
+    session_max_concurrency: int = Field(
+        default=4, description="Maximum number of tool calls run concurrently for one client session"
+    )
+    shutdown_timeout: float = Field(
+        default=10.0, description="Seconds in-flight requests are given to finish on shutdown"
+    )
+    
     # Logging settings
     log_level: str = Field(default="INFO", description="Logging level")
     log_format: str = Field(
@@ -24,6 +38,90 @@ class Settings(BaseSettings):
     # Notion API settings
     notion_api_key: Optional[str] = Field(default=None, description="Notion API key")
     notion_version: str = Field(default="2022-06-28", description="Notion API version")
+    notion_base_url: str = Field(
+        default="https://api.notion.com", description="Root URL of the Notion API (for proxies or a local fake)"
+    )
+    notion_timeout_ms: int = Field(default=60_000, description="Timeout for Notion API requests in milliseconds")
+    notion_max_connections: int = Field(
+        default=20, description="Maximum number of pooled HTTP connections to the Notion API"
+    )
+    
+    # Rate limiting and retries
+    rate_limit_per_second: float = Field(default=3.0, description="Sustained Notion requests per second")
+    rate_limit_burst: int = Field(default=3, description="Number of requests allowed in a burst")
+    retry_max_attempts: int = Field(default=5, description="Maximum retries for rate-limited or failed requests")
+    retry_base_delay: float = Field(default=0.5, description="Base delay in seconds for exponential backoff")
+    retry_max_delay: float = Field(default=30.0, description="Maximum backoff delay in seconds")
+    
+    # Block tree fetching
+    block_fetch_concurrency: int = Field(
+        default=8, description="Maximum number of concurrent block children requests per page"
+    )
+    block_fetch_max_depth: int = Field(default=20, description="Maximum nesting depth fetched for a page")
+    block_fetch_max_blocks: int = Field(default=10_000, description="Maximum number of blocks fetched for a page")
+    
+    # Rendering
+    render_workers: int = Field(
+        default=2, description="Worker threads rendering large block trees off the event loop (0 renders inline)"
+    )
+    render_offload_min_blocks: int = Field(
+        default=2000, description="Minimum number of blocks in a tree before its rendering is offloaded"
+    )
+    
+    # Output budget
+    output_max_chars: int = Field(
+        default=100_000,
+        description=(
+            "Default character budget of content and listing tool output; longer output ends with "
+            "a continuation cursor (0 disables)"
+        ),
+    )
+
+    # Relation resolution
+    relation_resolve_max: int = Field(
+        default=500, description="Maximum distinct related pages whose titles are resolved for one database query"
+    )
+
+    # Response cache
+    cache_enabled: bool = Field(default=True, description="Cache Notion responses in memory")
+    cache_max_entries: int = Field(default=1000, description="Maximum number of cached responses")
+    cache_max_bytes: int = Field(default=50_000_000, description="Maximum estimated size of the cache in bytes")
+    cache_page_ttl: float = Field(default=30.0, description="Seconds a retrieved page object stays cached")
+    cache_blocks_ttl: float = Field(
+        default=3600.0, description="Seconds rendered page content stays cached (revalidated by last_edited_time)"
+    )
+    cache_search_ttl: float = Field(default=60.0, description="Seconds search results stay cached")
+    cache_database_ttl: float = Field(default=60.0, description="Seconds database query results stay cached")
+    
+    # Instrumentation
+    metrics_enabled: bool = Field(
+        default=True, description="Record tool and Notion request latencies for server_stats and /metrics"
+    )
+    
+    # Persistent page store
+    page_store_path: Optional[str] = Field(
+        default=None, description="Path of the SQLite file used to persist pages across restarts (disabled if unset)"
+    )
+    
+    # Workspace sync
+    sync_enabled: bool = Field(default=False, description="Keep a local mirror of the workspace (requires page_store_path)")
+    sync_scopes: str = Field(
+        default="workspace",
+        description="Comma-separated sync scopes: 'workspace', 'database:<id>' or 'page:<id>'",
+    )
+    sync_interval: float = Field(default=300.0, description="Seconds between background sync passes")
+    sync_max_age: float = Field(
+        default=600.0, description="Seconds mirrored pages are served without revalidation after a sync pass"
+    )
+    sync_concurrency: int = Field(default=4, description="Number of changed pages refetched concurrently")
+    
+    # Resources
+    resource_poll_interval: float = Field(
+        default=60.0, description="Seconds between checks of subscribed resources for changes"
+    )
+    
+    # Bulk export
+    export_workers: int = Field(default=4, description="Number of pages fetched concurrently by the export CLI")
     
     class Config:
         env_file = ".env"
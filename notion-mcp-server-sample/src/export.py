@@ -0,0 +1,369 @@
+"""
+Resumable bulk export of Notion page subtrees and databases to local files.
+
+    python -m src.export --page <id> --out export/
+    python -m src.export --database <id> --format jsonl --out export/
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from functools import partial
+from typing import Any, Dict, IO, Iterator, List, Optional, Set, Tuple
+
+import httpx
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from src.config import settings
+from src.tools.client import close_notion_client
+from src.tools.models import Block
+from src.tools.notion_tools import NotionTools
+from src.tools.pagination import paginate
+from src.tools.properties import object_title, property_value
+from src.tools.rate_limit import BULK
+from src.tools.renderers import render_block_lines
+from src.tools.store import normalize_id
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = ".export-journal.jsonl"
+JSONL_NAME = "pages.jsonl"
+
+# Blocks that point at other exported items; their content is exported separately
+CHILD_TYPES = ("child_page", "child_database")
+
+# Items are ("page" | "database", Notion ID)
+Item = Tuple[str, str]
+
+
+class ExportError(Exception):
+    """Raised when a page cannot be exported completely."""
+
+
+class ExportJournal:
+    """Append-only log of queued and exported items, from which an export resumes.
+
+    An item is journaled as queued when it is discovered and as done once
+    its file is written and its children are queued, so the queued items
+    without a done entry are exactly the work left. A partial last line
+    left by a crash is ignored. Items are keyed by normalized ID, so
+    hyphenated and compact forms of an ID are one item.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the journal at ``path``."""
+        self.path = path
+        self.queued: Dict[str, Item] = {}
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        """Replay the journal."""
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Interrupted write
+                    continue
+                if entry["event"] == "queued":
+                    self.queued[normalize_id(entry["id"])] = (entry["kind"], entry["id"])
+                elif entry["event"] == "done":
+                    self.done.add(normalize_id(entry["id"]))
+
+    def pending(self) -> List[Item]:
+        """Return the queued items not exported yet, in discovery order."""
+        return [item for key, item in self.queued.items() if key not in self.done]
+
+    def add(self, kind: str, item_id: str) -> bool:
+        """Journal a discovered item; return False if it was already known."""
+        key = normalize_id(item_id)
+        if key in self.queued:
+            return False
+        self.queued[key] = (kind, item_id)
+        self._append({"event": "queued", "kind": kind, "id": item_id})
+        return True
+
+    def mark_done(self, item_id: str) -> None:
+        """Journal an exported item."""
+        self.done.add(normalize_id(item_id))
+        self._append({"event": "done", "id": item_id})
+
+    def _append(self, entry: Dict[str, str]) -> None:
+        """Write one entry, flushed so it survives the process being killed."""
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+
+class Exporter:
+    """Walk page subtrees and databases and write every page to disk.
+
+    Pages are fetched by a bounded pool of workers and each page is written
+    as soon as it is rendered, so memory holds one block tree per worker
+    rather than the whole export. Child pages and databases found in a
+    page's blocks, and the rows of databases, are queued for export.
+    Pages are written as one Markdown file each, or appended to a single
+    JSON Lines file.
+    """
+
+    def __init__(
+        self,
+        tools: NotionTools,
+        out_dir: str,
+        output_format: str = "markdown",
+        workers: int = 4,
+        restart: bool = False,
+    ):
+        """Prepare the output directory, resuming a previous export unless ``restart`` is set."""
+        self.tools = tools
+        self.out_dir = out_dir
+        self.output_format = output_format
+        self.workers = workers
+        self.stats = {"exported": 0, "failed": 0, "resumed": 0}
+
+        os.makedirs(out_dir, exist_ok=True)
+        journal_path = os.path.join(out_dir, JOURNAL_NAME)
+        jsonl_path = os.path.join(out_dir, JSONL_NAME)
+        if restart:
+            for path in (journal_path, jsonl_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self.journal = ExportJournal(journal_path)
+        self._jsonl: Optional[IO[str]] = None
+        if output_format == "jsonl":
+            _drop_partial_line(jsonl_path)
+            # A page written just before a crash may lack its done entry; don't append it twice
+            for page_id in _jsonl_ids(jsonl_path):
+                if normalize_id(page_id) not in self.journal.done:
+                    self.journal.mark_done(page_id)
+            self._jsonl = open(jsonl_path, "a", encoding="utf-8")
+
+    async def run(self, roots: List[Item]) -> Dict[str, int]:
+        """Export the roots and everything below them."""
+        self.stats["resumed"] = len(self.journal.done)
+        queue: "asyncio.Queue[Item]" = asyncio.Queue()
+        for item in self.journal.pending():
+            queue.put_nowait(item)
+        for kind, item_id in roots:
+            if self.journal.add(kind, item_id):
+                queue.put_nowait((kind, item_id))
+        if self.stats["resumed"]:
+            logger.info(f"Resuming export: {self.stats['resumed']} item(s) done, {queue.qsize()} pending")
+
+        workers = [asyncio.ensure_future(self._work(queue)) for _ in range(self.workers)]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return self.stats
+
+    def close(self) -> None:
+        """Close the journal and output files."""
+        self.journal.close()
+        if self._jsonl:
+            self._jsonl.close()
+
+    async def _work(self, queue: "asyncio.Queue[Item]") -> None:
+        """Export queued items until cancelled."""
+        while True:
+            kind, item_id = await queue.get()
+            try:
+                if kind == "database":
+                    await self._export_database(item_id, queue)
+                else:
+                    await self._export_page(item_id, queue)
+                self.journal.mark_done(item_id)
+            except (ExportError, HTTPResponseError, RequestTimeoutError, httpx.TransportError, OSError) as e:
+                # Left pending in the journal, so the next run retries it
+                logger.error(f"Error exporting {kind} {item_id}: {e}")
+                self.stats["failed"] += 1
+            except Exception as e:
+                logger.error(f"Unexpected error exporting {kind} {item_id}: {e}")
+                self.stats["failed"] += 1
+            finally:
+                queue.task_done()
+
+    def _discover(self, kind: str, item_id: str, queue: "asyncio.Queue[Item]") -> None:
+        """Queue an item found during the walk, unless it is already known."""
+        if self.journal.add(kind, item_id):
+            queue.put_nowait((kind, item_id))
+
+    async def _export_database(self, database_id: str, queue: "asyncio.Queue[Item]") -> None:
+        """Queue every row of a database."""
+        query = partial(self.tools._request, self.tools.client.databases.query, priority=BULK)
+        async for page in paginate(query, database_id=database_id):
+            self._discover("page", page["id"], queue)
+
+    async def _export_page(self, page_id: str, queue: "asyncio.Queue[Item]") -> None:
+        """Fetch, render and write one page, queueing its child pages and databases."""
+        page = await self.tools._request(self.tools.client.pages.retrieve, page_id, priority=BULK)
+        fetcher = self.tools._new_block_fetcher(priority=BULK, leaf_types=CHILD_TYPES)
+        blocks = await fetcher.fetch(page_id)
+        if fetcher.errors:
+            raise ExportError(f"{fetcher.errors} block subtree(s) could not be fetched")
+
+        for block in _walk(blocks):
+            if block.type == "child_page":
+                self._discover("page", block.id, queue)
+            elif block.type == "child_database":
+                self._discover("database", block.id, queue)
+
+        lines = await self.tools.render_pool.run(fetcher.block_count, render_block_lines, blocks, 0)
+        if fetcher.truncated:
+            lines.append(
+                f"[Content truncated: depth limit {fetcher.max_depth} or block limit {fetcher.max_blocks} reached]"
+            )
+
+        if self._jsonl:
+            self._write_jsonl(page, lines)
+        else:
+            self._write_markdown(page, lines)
+
+        self.stats["exported"] += 1
+        if self.stats["exported"] % 100 == 0:
+            logger.info(f"Exported {self.stats['exported']} page(s), {queue.qsize()} queued")
+
+    def _write_markdown(self, page: Dict[str, Any], lines: List[str]) -> None:
+        """Write a page to its own Markdown file, replacing it atomically."""
+        path = os.path.join(self.out_dir, f"{normalize_id(page['id'])}.md")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(f"# {object_title(page)}\n\n")
+            f.write(f"- ID: {page['id']}\n")
+            f.write(f"- URL: {page.get('url')}\n")
+            f.write(f"- Last edited: {page.get('last_edited_time')}\n\n")
+            for line in lines:
+                if line.strip():
+                    f.write(line)
+                    f.write("\n")
+        os.replace(path + ".tmp", path)
+
+    def _write_jsonl(self, page: Dict[str, Any], lines: List[str]) -> None:
+        """Append a page as one JSON line."""
+        record = {
+            "id": page["id"],
+            "title": object_title(page),
+            "url": page.get("url"),
+            "parent": page.get("parent"),
+            "created_time": page.get("created_time"),
+            "last_edited_time": page.get("last_edited_time"),
+            "properties": {name: property_value(prop) for name, prop in page.get("properties", {}).items()},
+            "content": "\n".join(line for line in lines if line.strip()),
+        }
+        self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._jsonl.flush()
+
+
+def _walk(blocks: List[Block]) -> List[Block]:
+    """Return every block of a fetched tree."""
+    found = []
+    stack = list(blocks)
+    while stack:
+        block = stack.pop()
+        found.append(block)
+        stack.extend(block.children or ())
+    return found
+
+
+def _drop_partial_line(path: str) -> None:
+    """Truncate a JSON Lines file after its last complete line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        position = end
+        while position > 0:
+            step = min(65536, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != end:
+            f.truncate(position)
+
+
+def _jsonl_ids(path: str) -> Iterator[str]:
+    """Yield the page IDs of the records in a JSON Lines export."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)["id"]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the export command line."""
+    parser = argparse.ArgumentParser(description="Export Notion page subtrees and databases to local files")
+    parser.add_argument("--page", action="append", default=[], help="Root page to export with its subpages (repeatable)")
+    parser.add_argument("--database", action="append", default=[], help="Database to export (repeatable)")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--format", choices=["markdown", "jsonl"], default="markdown", help="Output format")
+    parser.add_argument(
+        "--workers", type=int, default=settings.export_workers, help="Pages fetched concurrently"
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    args = parser.parse_args(argv)
+    if not args.page and not args.database:
+        parser.error("give at least one --page or --database")
+    return args
+
+
+async def export(args: argparse.Namespace) -> Dict[str, int]:
+    """Run an export described by parsed command line arguments."""
+    tools = NotionTools()
+    tools._check_client()
+    exporter = Exporter(tools, args.out, args.format, max(1, args.workers), args.restart)
+    roots = [("page", page_id) for page_id in args.page]
+    roots.extend(("database", database_id) for database_id in args.database)
+    try:
+        return await exporter.run(roots)
+    finally:
+        exporter.close()
+        await tools.close()
+        await close_notion_client()
+
+
+def main() -> None:
+    """Export from the command line."""
+    args = parse_args()
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format=settings.log_format,
+    )
+
+    try:
+        stats = asyncio.run(export(args))
+    except KeyboardInterrupt:
+        logger.info("Export interrupted; run the same command again to resume")
+        sys.exit(130)
+    except Exception as e:
+        logger.error(f"Export failed: {e}")
+        sys.exit(1)
+
+    logger.info(
+        f"Export finished: {stats['exported']} page(s) exported, {stats['resumed']} item(s) already done, "
+        f"{stats['failed']} failed"
+    )
+    if stats["failed"]:
+        logger.warning("Run the same command again to retry the failed items")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
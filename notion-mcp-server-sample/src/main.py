@@ -2,9 +2,11 @@
 Main entry point for the MCP server.
 """
 
+import argparse
 import asyncio
 import logging
 import sys
+from typing import List, Optional
 
 from src.config import settings
 from src.server import MCPServer
@@ -18,6 +20,22 @@ def setup_logging() -> None:
     )
 
 
+def parse_args(argv: Optional[List[str]] = None) -> None:
+    """Apply command line overrides to the settings."""
+    parser = argparse.ArgumentParser(description=settings.server_name)
+    parser.add_argument("--transport", choices=["stdio", "http"], help="MCP transport (default: stdio)")
+    parser.add_argument("--host", help="Interface the HTTP transport listens on")
+    parser.add_argument("--port", type=int, help="Port the HTTP transport listens on")
+    args = parser.parse_args(argv)
+
+    if args.transport:
+        settings.transport = args.transport
+    if args.host:
+        settings.http_host = args.host
+    if args.port:
+        settings.http_port = args.port
+
+
 async def main_async() -> None:
     """Main async entry point."""
     setup_logging()
@@ -38,6 +56,7 @@ async def main_async() -> None:
 
 def main() -> None:
     """Main entry point."""
+    parse_args()
     try:
         asyncio.run(main_async())
     except KeyboardInterrupt:
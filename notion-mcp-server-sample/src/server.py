@@ -2,36 +2,505 @@
 MCP Server implementation for Notion integration.
 """
 
+import asyncio
+import contextlib
 import logging
+import weakref
+from typing import Any, AsyncIterator, Dict
 
 from mcp import McpError
-from mcp.server import Server
+from mcp.server import NotificationOptions, Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
 from mcp.types import (
     CallToolRequest,
     CallToolResult,
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    ErrorData,
     ListToolsRequest,
     ListToolsResult,
+    Resource,
+    ResourceTemplate,
+    ServerCapabilities,
     TextContent,
     Tool,
 )
+from notion_client.errors import APIResponseError
+from pydantic import AnyUrl
 
 from src.config import settings
+from src.tools.client import close_notion_client
+from src.tools.metrics import get_metrics
 from src.tools.notion_tools import NotionTools
+from src.tools.registry import ToolArgumentError, ToolRegistry
+from src.tools.resources import (
+    DATABASE_TEMPLATE,
+    MIME_TYPE,
+    PAGE_TEMPLATE,
+    RESOURCE_NOT_FOUND,
+    NotionResources,
+    ResourceError,
+)
+from src.tools.sync import WorkspaceSync, parse_scopes
 
 
 logger = logging.getLogger(__name__)
 
 
+# Projection and output format shared by the listing tools
+FIELDS_SCHEMA = {
+    "type": "array",
+    "description": (
+        "Fields to include: id, object, title, url, created_time, last_edited_time, archived, "
+        "or property names, rendered with their typed values (select, date, number, relation, ...)"
+    ),
+    "items": {"type": "string"},
+}
+
+OUTPUT_FORMAT_SCHEMA = {
+    "type": "string",
+    "enum": ["markdown", "ndjson", "table"],
+    "description": (
+        "Output format: markdown (default), ndjson (one JSON object per item) "
+        "or table (one Markdown table row per item)"
+    ),
+    "default": "markdown",
+}
+
+# Output budget and continuation shared by the content and listing tools
+MAX_CHARS_SCHEMA = {
+    "type": "integer",
+    "description": (
+        "Maximum characters of output (default: OUTPUT_MAX_CHARS, 0 for no limit). Longer output "
+        "ends with a cursor to continue from"
+    ),
+    "minimum": 0,
+}
+
+CURSOR_SCHEMA = {
+    "type": "string",
+    "description": (
+        "Cursor returned by a previous call whose output was cut at the budget; the call is "
+        "continued where it stopped and its other arguments are taken from the cursor"
+    ),
+}
+
+GET_NOTION_PAGES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "Search query for pages (optional)",
+        },
+        "page_size": {
+            "type": "integer",
+            "description": "Number of pages to retrieve (default: 10, max: 100)",
+            "minimum": 1,
+            "maximum": 100,
+            "default": 10,
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Total number of pages to return, following pagination (overrides page_size)",
+            "minimum": 1,
+        },
+        "fields": FIELDS_SCHEMA,
+        "format": OUTPUT_FORMAT_SCHEMA,
+        "max_chars": MAX_CHARS_SCHEMA,
+        "cursor": CURSOR_SCHEMA,
+    },
+    "additionalProperties": False,
+}
+
+GET_PAGE_CONTENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "page_id": {
+            "type": "string",
+            "description": "The ID of the Notion page to retrieve content from",
+        },
+        "include_children": {
+            "type": "boolean",
+            "description": "Whether to include child blocks recursively (default: true)",
+            "default": True,
+        },
+        "max_chars": MAX_CHARS_SCHEMA,
+        "cursor": CURSOR_SCHEMA,
+    },
+    "required": ["page_id"],
+    "additionalProperties": False,
+}
+
+SEARCH_NOTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "Search query string",
+        },
+        "filter": {
+            "type": "object",
+            "description": "Filter options for search",
+            "properties": {
+                "value": {
+                    "type": "string",
+                    "enum": ["page", "database"],
+                    "description": "Type of object to search for",
+                },
+                "property": {
+                    "type": "string",
+                    "enum": ["object"],
+                    "description": "Property to filter by",
+                },
+            },
+        },
+        "page_size": {
+            "type": "integer",
+            "description": "Number of results to return (default: 10, max: 100)",
+            "minimum": 1,
+            "maximum": 100,
+            "default": 10,
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Total number of results to return, following pagination (overrides page_size)",
+            "minimum": 1,
+        },
+        "fields": FIELDS_SCHEMA,
+        "format": OUTPUT_FORMAT_SCHEMA,
+        "max_chars": MAX_CHARS_SCHEMA,
+        "cursor": CURSOR_SCHEMA,
+    },
+    "required": ["query"],
+    "additionalProperties": False,
+}
+
+GET_DATABASE_PAGES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "database_id": {
+            "type": "string",
+            "description": "The ID of the Notion database",
+        },
+        "page_size": {
+            "type": "integer",
+            "description": "Number of pages to retrieve (default: 10, max: 100)",
+            "minimum": 1,
+            "maximum": 100,
+            "default": 10,
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Total number of pages to return, following pagination (overrides page_size)",
+            "minimum": 1,
+        },
+        "filter": {
+            "type": "object",
+            "description": "Filter conditions for database query",
+        },
+        "sorts": {
+            "type": "array",
+            "description": "Sort conditions for database query",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "property": {"type": "string"},
+                    "direction": {
+                        "type": "string",
+                        "enum": ["ascending", "descending"],
+                    },
+                },
+            },
+        },
+        "fields": FIELDS_SCHEMA,
+        "format": OUTPUT_FORMAT_SCHEMA,
+        "resolve_relations": {
+            "type": "boolean",
+            "description": (
+                "Show the titles of the pages referenced by the relation and rollup properties listed "
+                "in fields, retrieving each distinct related page once"
+            ),
+            "default": False,
+        },
+        "max_chars": MAX_CHARS_SCHEMA,
+        "cursor": CURSOR_SCHEMA,
+    },
+    "required": ["database_id"],
+    "additionalProperties": False,
+}
+
+AGGREGATE_DATABASE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "database_id": {
+            "type": "string",
+            "description": "The ID of the Notion database",
+        },
+        "group_by": {
+            "type": "string",
+            "description": (
+                "Property (or field such as created_time) to group rows by; rows with several values "
+                "(multi-select, relation, people) count in each value's group. Omit for one overall group"
+            ),
+        },
+        "sum": {
+            "type": "array",
+            "description": "Number properties to sum per group",
+            "items": {"type": "string"},
+        },
+        "min": {
+            "type": "array",
+            "description": "Properties whose minimum to report per group (numbers, dates, text)",
+            "items": {"type": "string"},
+        },
+        "max": {
+            "type": "array",
+            "description": "Properties whose maximum to report per group (numbers, dates, text)",
+            "items": {"type": "string"},
+        },
+        "distinct": {
+            "type": "array",
+            "description": "Properties whose distinct values to list per group (up to 100 each)",
+            "items": {"type": "string"},
+        },
+        "filter": {
+            "type": "object",
+            "description": "Filter conditions for database query",
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Maximum number of rows to aggregate (default: all rows)",
+            "minimum": 1,
+        },
+        "format": {
+            "type": "string",
+            "enum": ["table", "ndjson"],
+            "description": "Output format: a Markdown table (default) or one JSON object per group",
+            "default": "table",
+        },
+    },
+    "required": ["database_id"],
+    "additionalProperties": False,
+}
+
+SEARCH_LOCAL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "Words to search for in page titles and block text",
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Maximum number of matches to return (default: 10)",
+            "minimum": 1,
+            "maximum": 100,
+            "default": 10,
+        },
+    },
+    "required": ["query"],
+    "additionalProperties": False,
+}
+
+GET_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "page_ids": {
+            "type": "array",
+            "description": "IDs of pages whose content to retrieve",
+            "items": {"type": "string"},
+            "maxItems": 50,
+        },
+        "database_ids": {
+            "type": "array",
+            "description": "IDs of databases whose pages to list",
+            "items": {"type": "string"},
+            "maxItems": 50,
+        },
+        "include_children": {
+            "type": "boolean",
+            "description": "Whether to include child blocks of pages recursively (default: true)",
+            "default": True,
+        },
+        "page_size": {
+            "type": "integer",
+            "description": "Number of pages to list per database (default: 10, max: 100)",
+            "minimum": 1,
+            "maximum": 100,
+            "default": 10,
+        },
+        "max_chars": MAX_CHARS_SCHEMA,
+        "cursor": CURSOR_SCHEMA,
+    },
+    "anyOf": [{"required": ["page_ids"]}, {"required": ["database_ids"]}, {"required": ["cursor"]}],
+    "additionalProperties": False,
+}
+
+SERVER_STATS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "format": {
+            "type": "string",
+            "enum": ["text", "prometheus"],
+            "description": "Output format (default: text)",
+            "default": "text",
+        },
+    },
+    "additionalProperties": False,
+}
+
+SYNC_WORKSPACE_SCHEMA = {
+    "type": "object",
+    "properties": {},
+    "additionalProperties": False,
+}
+
+
+RESOURCE_TEMPLATES = [
+    ResourceTemplate(
+        uriTemplate=PAGE_TEMPLATE,
+        name="notion-page",
+        description="Rendered content of a Notion page; its version is the page's last_edited_time",
+        mimeType=MIME_TYPE,
+    ),
+    ResourceTemplate(
+        uriTemplate=DATABASE_TEMPLATE,
+        name="notion-database",
+        description=(
+            "Pages of a Notion database (up to 1000); its version is the newest last_edited_time of its rows"
+        ),
+        mimeType=MIME_TYPE,
+    ),
+]
+
+
+class NotionServer(Server):
+    """Low-level MCP server that also advertises resource subscriptions."""
+
+    def get_capabilities(
+        self,
+        notification_options: NotificationOptions,
+        experimental_capabilities: Dict[str, Dict[str, Any]],
+    ) -> ServerCapabilities:
+        """Report the handlers' capabilities, with ``subscribe`` set when resources are served."""
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None:
+            # The base class always reports subscriptions as unsupported
+            capabilities.resources.subscribe = True
+        return capabilities
+
+
 class MCPServer:
     """MCP Server for Notion integration."""
 
     def __init__(self):
         """Initialize the MCP server."""
-        self.app = Server("notion-mcp-server")
+        self.app = NotionServer("notion-mcp-server")
         self.notion_tools = NotionTools()
+        self.resources = NotionResources(self.notion_tools, settings.resource_poll_interval)
+        self.sync = None
+        if self.notion_tools.store:
+            self.sync = WorkspaceSync(self.notion_tools, parse_scopes(settings.sync_scopes))
+        self.metrics = get_metrics()
+        self.registry = self._register_tools()
+        self._session_slots: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
         self._setup_handlers()
 
+    def _register_tools(self) -> ToolRegistry:
+        """Declare the tools exposed by the server."""
+        registry = ToolRegistry()
+        tools = self.notion_tools
+
+        registry.add(
+            "get_notion_pages",
+            "Retrieve pages from Notion workspace",
+            GET_NOTION_PAGES_SCHEMA,
+            tools.get_notion_pages,
+            arguments={"format": "output_format"},
+        )
+        registry.add(
+            "get_page_content",
+            "Get content (blocks) from a specific Notion page",
+            GET_PAGE_CONTENT_SCHEMA,
+            tools.get_page_content,
+        )
+        registry.add(
+            "search_notion",
+            "Search for pages and databases in Notion",
+            SEARCH_NOTION_SCHEMA,
+            tools.search_notion,
+            arguments={"filter": "filter_options", "format": "output_format"},
+        )
+        registry.add(
+            "get_database_pages",
+            "Get pages from a specific Notion database",
+            GET_DATABASE_PAGES_SCHEMA,
+            tools.get_database_pages,
+            arguments={"filter": "filter_conditions", "format": "output_format"},
+        )
+        registry.add(
+            "aggregate_database",
+            (
+                "Count, sum, min/max and distinct values of database rows grouped by a property, "
+                "computed on the server over every page of the query; only the per-group results "
+                "are returned"
+            ),
+            AGGREGATE_DATABASE_SCHEMA,
+            tools.aggregate_database,
+            arguments={
+                "sum": "sum_fields",
+                "min": "min_fields",
+                "max": "max_fields",
+                "distinct": "distinct_fields",
+                "filter": "filter_conditions",
+                "format": "output_format",
+            },
+        )
+        registry.add(
+            "get_batch",
+            (
+                "Get the content of several pages and the pages of several databases in one call, "
+                "fetched concurrently; each item reports its own result or error"
+            ),
+            GET_BATCH_SCHEMA,
+            tools.get_batch,
+        )
+        registry.add(
+            "search_local",
+            (
+                "Full-text search over the content of pages in the local mirror, "
+                "ranked by relevance, without calling the Notion API"
+            ),
+            SEARCH_LOCAL_SCHEMA,
+            tools.search_local,
+        )
+        registry.add(
+            "sync_workspace",
+            "Refresh the local mirror with pages edited since the last sync",
+            SYNC_WORKSPACE_SCHEMA,
+            self._sync_workspace,
+        )
+        registry.add(
+            "server_stats",
+            (
+                "Report server statistics: per-tool and per-endpoint latencies, Notion requests per "
+                "tool call, cache hit rate, rate limiting and retries, and concurrency"
+            ),
+            SERVER_STATS_SCHEMA,
+            tools.server_stats,
+            arguments={"format": "output_format"},
+        )
+
+        registry.freeze()
+        return registry
+
+    async def _sync_workspace(self) -> str:
+        """Run a sync pass when a page store is configured."""
+        if not self.sync:
+            return "Workspace sync requires PAGE_STORE_PATH to be configured."
+        return await self.sync.sync_workspace()
+
     def _setup_handlers(self) -> None:
         """Set up MCP handlers."""
 
@@ -39,165 +508,87 @@ class MCPServer:
         async def handle_list_tools() -> list[Tool]:
             """List available tools."""
             logger.info("Listing available tools")
-            return [
-                Tool(
-                    name="get_notion_pages",
-                    description="Retrieve pages from Notion workspace",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query for pages (optional)",
-                            },
-                            "page_size": {
-                                "type": "integer",
-                                "description": "Number of pages to retrieve (default: 10, max: 100)",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "default": 10,
-                            },
-                        },
-                        "additionalProperties": False,
-                    },
-                ),
-                Tool(
-                    name="get_page_content",
-                    description="Get content (blocks) from a specific Notion page",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "page_id": {
-                                "type": "string",
-                                "description": "The ID of the Notion page to retrieve content from",
-                            },
-                            "include_children": {
-                                "type": "boolean",
-                                "description": "Whether to include child blocks recursively (default: true)",
-                                "default": True,
-                            },
-                        },
-                        "required": ["page_id"],
-                        "additionalProperties": False,
-                    },
-                ),
-                Tool(
-                    name="search_notion",
-                    description="Search for pages and databases in Notion",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query string",
-                            },
-                            "filter": {
-                                "type": "object",
-                                "description": "Filter options for search",
-                                "properties": {
-                                    "value": {
-                                        "type": "string",
-                                        "enum": ["page", "database"],
-                                        "description": "Type of object to search for",
-                                    },
-                                    "property": {
-                                        "type": "string",
-                                        "enum": ["object"],
-                                        "description": "Property to filter by",
-                                    },
-                                },
-                            },
-                            "page_size": {
-                                "type": "integer",
-                                "description": "Number of results to return (default: 10, max: 100)",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "default": 10,
-                            },
-                        },
-                        "required": ["query"],
-                        "additionalProperties": False,
-                    },
-                ),
-                Tool(
-                    name="get_database_pages",
-                    description="Get pages from a specific Notion database",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "database_id": {
-                                "type": "string",
-                                "description": "The ID of the Notion database",
-                            },
-                            "page_size": {
-                                "type": "integer",
-                                "description": "Number of pages to retrieve (default: 10, max: 100)",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "default": 10,
-                            },
-                            "filter": {
-                                "type": "object",
-                                "description": "Filter conditions for database query",
-                            },
-                            "sorts": {
-                                "type": "array",
-                                "description": "Sort conditions for database query",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "property": {"type": "string"},
-                                        "direction": {
-                                            "type": "string",
-                                            "enum": ["ascending", "descending"],
-                                        },
-                                    },
-                                },
-                            },
-                        },
-                        "required": ["database_id"],
-                        "additionalProperties": False,
-                    },
-                ),
-            ]
+            return list(self.registry.tools)
 
-        @self.app.call_tool()
+        # Arguments are checked by the registry's compiled validators instead
+        @self.app.call_tool(validate_input=False)
         async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
             """Handle tool calls."""
-            logger.info(f"Calling tool: {name} with arguments: {arguments}")
+            logger.info(f"Calling tool: {name}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Arguments for {name}: {arguments}")
 
             try:
-                if name == "get_notion_pages":
-                    result = await self.notion_tools.get_notion_pages(
-                        query=arguments.get("query"),
-                        page_size=arguments.get("page_size", 10),
-                    )
-                elif name == "get_page_content":
-                    result = await self.notion_tools.get_page_content(
-                        page_id=arguments["page_id"],
-                        include_children=arguments.get("include_children", True),
-                    )
-                elif name == "search_notion":
-                    result = await self.notion_tools.search_notion(
-                        query=arguments["query"],
-                        filter_options=arguments.get("filter"),
-                        page_size=arguments.get("page_size", 10),
-                    )
-                elif name == "get_database_pages":
-                    result = await self.notion_tools.get_database_pages(
-                        database_id=arguments["database_id"],
-                        page_size=arguments.get("page_size", 10),
-                        filter_conditions=arguments.get("filter"),
-                        sorts=arguments.get("sorts"),
-                    )
-                else:
-                    raise McpError(f"Unknown tool: {name}")
-
+                # Only registered tools get metric series, so clients can't create them at will
+                instrumented = self.metrics.enabled and self.registry.get(name) is not None
+                async with self._session_semaphore():
+                    with self.metrics.tool_call(name) if instrumented else contextlib.nullcontext():
+                        result = await self.registry.call(name, arguments or {})
                 return [TextContent(type="text", text=result)]
 
+            except ToolArgumentError as e:
+                logger.error(f"Invalid call to tool {name}: {e}")
+                raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
             except Exception as e:
                 logger.error(f"Error calling tool {name}: {e}")
-                raise McpError(f"Tool execution failed: {str(e)}")
+                raise McpError(ErrorData(code=INTERNAL_ERROR, message=f"Tool execution failed: {str(e)}"))
+
+        @self.app.list_resources()
+        async def handle_list_resources() -> list[Resource]:
+            """List concrete resources; pages and databases are addressed through the templates."""
+            return []
+
+        @self.app.list_resource_templates()
+        async def handle_list_resource_templates() -> list[ResourceTemplate]:
+            """List the page and database resource templates."""
+            return RESOURCE_TEMPLATES
+
+        @self.app.read_resource()
+        async def handle_read_resource(uri: AnyUrl) -> list[ReadResourceContents]:
+            """Render a page or database, with its version in the contents' metadata."""
+            logger.info(f"Reading resource: {uri}")
+            try:
+                async with self._session_semaphore():
+                    text, version = await self.resources.read(str(uri))
+                return [ReadResourceContents(content=text, mime_type=MIME_TYPE, meta={"version": version})]
+            except Exception as e:
+                raise self._resource_error(uri, e)
+
+        @self.app.subscribe_resource()
+        async def handle_subscribe_resource(uri: AnyUrl) -> None:
+            """Watch a page or database for the current session."""
+            logger.info(f"Subscribing to resource: {uri}")
+            try:
+                await self.resources.subscribe(str(uri), self.app.request_context.session)
+            except Exception as e:
+                raise self._resource_error(uri, e)
+
+        @self.app.unsubscribe_resource()
+        async def handle_unsubscribe_resource(uri: AnyUrl) -> None:
+            """Stop watching a page or database for the current session."""
+            self.resources.unsubscribe(str(uri), self.app.request_context.session)
+
+    def _resource_error(self, uri: AnyUrl, error: Exception) -> McpError:
+        """Convert an error reading or watching a resource to an MCP error."""
+        logger.error(f"Error accessing resource {uri}: {error}")
+        if isinstance(error, ResourceError):
+            return McpError(ErrorData(code=INVALID_PARAMS, message=str(error)))
+        if isinstance(error, APIResponseError) and error.status == 404:
+            return McpError(ErrorData(code=RESOURCE_NOT_FOUND, message=f"Resource not found: {uri}"))
+        return McpError(ErrorData(code=INTERNAL_ERROR, message=f"Resource access failed: {error}"))
+
+    def _session_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrent tool calls of the current client session."""
+        try:
+            session = self.app.request_context.session
+        except LookupError:
+            # Handlers invoked outside an MCP session (e.g. by benchmarks) share one limit
+            session = self
+        semaphore = self._session_slots.get(session)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.session_max_concurrency)
+            self._session_slots[session] = semaphore
+        return semaphore
 
     async def run(self) -> None:
         """Run the MCP server."""
@@ -210,10 +601,82 @@ class MCPServer:
                 "Please set the NOTION_API_KEY environment variable."
             )
         
-        # Start the server using stdio transport
+        # Keep the local mirror up to date in the background
+        sync_task = None
+        if settings.sync_enabled:
+            if self.sync and settings.notion_api_key:
+                sync_task = asyncio.ensure_future(self.sync.run_periodically(settings.sync_interval))
+            else:
+                logger.warning("SYNC_ENABLED is set but PAGE_STORE_PATH or NOTION_API_KEY is missing")
+        
+        try:
+            if settings.transport == "http":
+                await self._run_http()
+            else:
+                await self._run_stdio()
+        finally:
+            if sync_task:
+                sync_task.cancel()
+            self.resources.close()
+            await self.notion_tools.close()
+            await close_notion_client()
+
+    async def _run_stdio(self) -> None:
+        """Serve a single client over stdin/stdout."""
         async with stdio_server() as (read_stream, write_stream):
             await self.app.run(
                 read_stream, 
                 write_stream, 
                 self.app.create_initialization_options()
             )
+
+    async def _run_http(self) -> None:
+        """Serve many concurrent client sessions over streamable HTTP.
+
+        All sessions share this process's tools, so caches, the connection
+        pool and the rate limiter are shared too. Metrics are served in
+        Prometheus format at ``/metrics``. On SIGINT/SIGTERM the server
+        stops accepting connections and gives in-flight requests
+        ``shutdown_timeout`` seconds to finish.
+        """
+        # Imported here to keep the web stack off the stdio startup path
+        import uvicorn
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        from starlette.applications import Starlette
+        from starlette.requests import Request
+        from starlette.responses import PlainTextResponse
+        from starlette.routing import Route
+        from starlette.types import Receive, Scope, Send
+
+        session_manager = StreamableHTTPSessionManager(app=self.app)
+
+        class MCPEndpoint:
+            """ASGI app of the MCP endpoint; Starlette routes callables that aren't functions as is."""
+
+            async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+                await session_manager.handle_request(scope, receive, send)
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[None]:
+            async with session_manager.run():
+                yield
+
+        async def handle_metrics(request: Request) -> PlainTextResponse:
+            return PlainTextResponse(
+                self.notion_tools.prometheus_metrics(), media_type="text/plain; version=0.0.4"
+            )
+
+        routes = [
+            # The exact path, so POSTs to it aren't redirected to a trailing slash
+            Route(settings.http_path, endpoint=MCPEndpoint(), methods=["GET", "POST", "DELETE"]),
+            Route("/metrics", endpoint=handle_metrics),
+        ]
+        config = uvicorn.Config(
+            Starlette(routes=routes, lifespan=lifespan),
+            host=settings.http_host,
+            port=settings.http_port,
+            log_level=settings.log_level.lower(),
+            timeout_graceful_shutdown=settings.shutdown_timeout,
+        )
+        logger.info(f"Serving MCP over HTTP at http://{settings.http_host}:{settings.http_port}{settings.http_path}")
+        await uvicorn.Server(config).serve()
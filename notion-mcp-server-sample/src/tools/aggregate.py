@@ -0,0 +1,165 @@
+"""
+Single-pass aggregation of database rows.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.tools.properties import format_value, ndjson_line, project, table_header, table_row
+
+
+# Groups beyond this many are counted under OTHER_GROUP, keeping memory bounded
+MAX_GROUPS = 1000
+
+# Distinct values kept per field and group
+MAX_DISTINCT = 100
+
+ALL_GROUP = "(all)"
+EMPTY_GROUP = "(empty)"
+OTHER_GROUP = "(other)"
+
+
+def _values(value: Any) -> Iterator[Any]:
+    """Yield the non-empty scalar values of a projected value, flattening lists."""
+    if isinstance(value, list):
+        for item in value:
+            yield from _values(item)
+    elif value is not None and value != "":
+        yield value
+
+
+def _comparable(value: Any) -> Any:
+    """Return a key under which numbers and other values compare among themselves."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, format_value(value))
+
+
+class GroupStats:
+    """Running statistics of one group."""
+
+    __slots__ = ("count", "sums", "mins", "maxs", "distinct", "truncated")
+
+    def __init__(self):
+        self.count = 0
+        self.sums: Dict[str, float] = {}
+        self.mins: Dict[str, Any] = {}
+        self.maxs: Dict[str, Any] = {}
+        self.distinct: Dict[str, set] = {}
+        # Fields whose distinct values exceeded MAX_DISTINCT
+        self.truncated: set = set()
+
+
+class Aggregation:
+    """Group-by counts, sums, min/max and distinct values computed one row at a time.
+
+    Only the aggregated properties of each row are extracted, and rows are
+    not kept, so memory is bounded by the number of groups (at most
+    ``MAX_GROUPS``) rather than the number of rows. Multi-valued properties
+    (multi-select, relations, people) count a row in the group of each value.
+    """
+
+    def __init__(
+        self,
+        group_by: Optional[str] = None,
+        sum_fields: Optional[List[str]] = None,
+        min_fields: Optional[List[str]] = None,
+        max_fields: Optional[List[str]] = None,
+        distinct_fields: Optional[List[str]] = None,
+    ):
+        """Initialize an empty aggregation."""
+        self.group_by = group_by
+        self.sum_fields = sum_fields or []
+        self.min_fields = min_fields or []
+        self.max_fields = max_fields or []
+        self.distinct_fields = distinct_fields or []
+        self.fields = list(
+            dict.fromkeys(
+                ([group_by] if group_by else [])
+                + self.sum_fields
+                + self.min_fields
+                + self.max_fields
+                + self.distinct_fields
+            )
+        )
+        self.rows = 0
+        self.groups: Dict[str, GroupStats] = {}
+
+    def add(self, item: Dict[str, Any]) -> None:
+        """Add a row (a page object) to the aggregation."""
+        self.rows += 1
+        record = project(item, self.fields)
+        if self.group_by:
+            keys = {format_value(value) for value in _values(record[self.group_by])} or {EMPTY_GROUP}
+        else:
+            keys = {ALL_GROUP}
+        for key in keys:
+            self._add_to_group(self._group(key), record)
+
+    def _group(self, key: str) -> GroupStats:
+        """Return the statistics of a group, creating it while under MAX_GROUPS."""
+        stats = self.groups.get(key)
+        if stats is None:
+            if len(self.groups) >= MAX_GROUPS:
+                key = OTHER_GROUP
+                stats = self.groups.get(key)
+            if stats is None:
+                stats = self.groups[key] = GroupStats()
+        return stats
+
+    def _add_to_group(self, stats: GroupStats, record: Dict[str, Any]) -> None:
+        """Update a group's statistics with one row."""
+        stats.count += 1
+        for field in self.sum_fields:
+            for value in _values(record[field]):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stats.sums[field] = stats.sums.get(field, 0) + value
+        for field in self.min_fields:
+            for value in _values(record[field]):
+                current = stats.mins.get(field)
+                if current is None or _comparable(value) < _comparable(current):
+                    stats.mins[field] = value
+        for field in self.max_fields:
+            for value in _values(record[field]):
+                current = stats.maxs.get(field)
+                if current is None or _comparable(value) > _comparable(current):
+                    stats.maxs[field] = value
+        for field in self.distinct_fields:
+            seen = stats.distinct.setdefault(field, set())
+            for value in _values(record[field]):
+                if len(seen) < MAX_DISTINCT:
+                    seen.add(format_value(value))
+                elif format_value(value) not in seen:
+                    stats.truncated.add(field)
+
+    def _columns(self) -> List[str]:
+        """Return the result columns after the group and count."""
+        return (
+            [f"sum({field})" for field in self.sum_fields]
+            + [f"min({field})" for field in self.min_fields]
+            + [f"max({field})" for field in self.max_fields]
+            + [f"distinct({field})" for field in self.distinct_fields]
+        )
+
+    def results(self) -> Iterator[Dict[str, Any]]:
+        """Yield one result per group, largest groups first."""
+        for key, stats in sorted(self.groups.items(), key=lambda group: (-group[1].count, group[0])):
+            result: Dict[str, Any] = {"group": key, "count": stats.count}
+            for field in self.sum_fields:
+                result[f"sum({field})"] = stats.sums.get(field, 0)
+            for field in self.min_fields:
+                result[f"min({field})"] = stats.mins.get(field)
+            for field in self.max_fields:
+                result[f"max({field})"] = stats.maxs.get(field)
+            for field in self.distinct_fields:
+                result[f"distinct({field})"] = sorted(stats.distinct.get(field, ()))
+                if field in stats.truncated:
+                    result[f"distinct({field})"].append("...")
+            yield result
+
+    def render(self, output_format: str = "table") -> str:
+        """Render the results as a Markdown table or as NDJSON."""
+        if output_format == "ndjson":
+            return "".join(ndjson_line(result) for result in self.results())
+
+        columns = [self.group_by or "group", "count"] + self._columns()
+        return table_header(columns) + "".join(table_row(result) for result in self.results())
@@ -0,0 +1,162 @@
+"""
+Concurrent block tree fetcher for Notion pages.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from notion_client import AsyncClient
+from notion_client.errors import APIResponseError
+
+from src.tools.models import Block
+from src.tools.pagination import paginate
+from src.tools.rate_limit import INTERACTIVE
+
+
+logger = logging.getLogger(__name__)
+
+# Synced block source ID -> (fetcher that fetches it, its children)
+SyncedSources = Dict[str, Tuple["BlockTreeFetcher", "asyncio.Future[List[Block]]"]]
+
+
+class BlockTreeFetcher:
+    """Fetch a block tree, expanding sibling subtrees concurrently.
+
+    Blocks are converted to compact ``Block`` records as they arrive.
+    Children are attached to their parent's ``children``, in the order
+    returned by Notion. If a subtree cannot be fetched, the error message is
+    stored in ``children_error`` instead.
+
+    Synced blocks that copy the same source are fetched once per tree; every
+    copy shares the source's children. Fetchers given the same
+    ``synced_sources`` map also share sources with each other.
+
+    Blocks whose type is in ``leaf_types`` are returned without their
+    children, for instance to stop at ``child_page`` blocks.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        max_concurrency: int = 8,
+        max_depth: int = 20,
+        max_blocks: int = 10_000,
+        request: Optional[Callable[..., Awaitable[Any]]] = None,
+        priority: int = INTERACTIVE,
+        synced_sources: Optional[SyncedSources] = None,
+        leaf_types: Tuple[str, ...] = (),
+    ):
+        """Initialize the fetcher with its parallelism and size limits.
+
+        ``request`` is the function used to send each API call (for instance
+        through a rate limiter); it defaults to calling the client directly.
+        """
+        self.client = client
+        self.request = request
+        self.priority = priority
+        self.max_depth = max_depth
+        self.max_blocks = max_blocks
+        self.block_count = 0
+        self.errors = 0
+        self.synced_reused = 0
+        self.truncated = False
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._synced_sources: SyncedSources = {} if synced_sources is None else synced_sources
+        self._leaf_types = leaf_types
+
+    async def fetch(self, block_id: str, include_children: bool = True) -> List[Block]:
+        """Fetch the children of a block (or page), recursively if requested."""
+        return await self._fetch_children(block_id, include_children, depth=0)
+
+    async def _list_page(self, **kwargs: Any) -> Dict[str, Any]:
+        """Request one page of block children."""
+        async with self._semaphore:
+            if self.request:
+                return await self.request(
+                    self.client.blocks.children.list, priority=self.priority, **kwargs
+                )
+            return await self.client.blocks.children.list(**kwargs)
+
+    async def _list_children(self, block_id: str, limit: int) -> List[Block]:
+        """List the direct children of a block, following pagination up to a limit."""
+        return [Block.from_api(block) async for block in paginate(self._list_page, limit=limit, block_id=block_id)]
+
+    async def _fetch_children(
+        self, block_id: str, include_children: bool, depth: int
+    ) -> List[Block]:
+        """Fetch one level of children and expand their subtrees concurrently."""
+        # Ask for one block past the budget so truncation can be detected
+        blocks = await self._list_children(block_id, self.max_blocks - self.block_count + 1)
+
+        remaining = self.max_blocks - self.block_count
+        if len(blocks) > remaining:
+            blocks = blocks[:max(remaining, 0)]
+            self.truncated = True
+        self.block_count += len(blocks)
+
+        if not include_children:
+            return blocks
+
+        expandable = [block for block in blocks if self._expands(block)]
+        if not expandable:
+            return blocks
+
+        if depth + 1 >= self.max_depth:
+            self.truncated = True
+            return blocks
+
+        await asyncio.gather(*(self._expand(block, depth + 1) for block in expandable))
+        return blocks
+
+    def _expands(self, block: Block) -> bool:
+        """Check whether the children of a block are fetched."""
+        return block.has_children and block.type not in self._leaf_types
+
+    async def _expand(self, block: Block, depth: int) -> None:
+        """Attach the subtree of a block, recording any API error."""
+        if self.block_count >= self.max_blocks:
+            self.truncated = True
+            return
+
+        try:
+            source_id = _synced_source_id(block)
+            if source_id is None:
+                block.children = await self._fetch_children(block.id, True, depth)
+                return
+
+            source = self._synced_sources.get(source_id)
+            if source is None:
+                source = (self, asyncio.ensure_future(self._fetch_children(block.id, True, depth)))
+                self._synced_sources[source_id] = source
+            else:
+                self.synced_reused += 1
+
+            owner, children = source
+            block.children = await asyncio.shield(children)
+            if owner is not self:
+                self._check_shared_subtree(block.children)
+        except APIResponseError as e:
+            logger.error(f"Error getting blocks for {block.id}: {e}")
+            block.children_error = str(e)
+            self.errors += 1
+
+    def _check_shared_subtree(self, blocks: List[Block]) -> None:
+        """Record errors and truncation inside a subtree fetched by another fetcher."""
+        stack = list(blocks)
+        while stack:
+            block = stack.pop()
+            if block.children_error is not None:
+                self.errors += 1
+            elif block.children is not None:
+                stack.extend(block.children)
+            elif block.has_children:
+                self.truncated = True
+
+
+def _synced_source_id(block: Block) -> Optional[str]:
+    """Return the ID of the original block behind a synced block, if it is one."""
+    if block.type != "synced_block":
+        return None
+    # A synced block's ``extra`` is the ID of the block it copies, None for originals
+    return block.extra or block.id
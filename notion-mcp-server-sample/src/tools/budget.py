@@ -0,0 +1,99 @@
+"""
+Output budgets and continuation cursors for long tool results.
+"""
+
+import base64
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Position in a list of output lines: (line index, character offset in that line)
+Position = Tuple[int, int]
+
+
+class CursorError(ValueError):
+    """Raised when a continuation cursor is malformed, foreign or out of date."""
+
+
+def encode_cursor(tool: str, **state: Any) -> str:
+    """Encode the state needed to continue a tool's output as an opaque token."""
+    data = json.dumps({"tool": tool, **state}, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, tool: str, *keys: str) -> Dict[str, Any]:
+    """Decode a cursor issued by ``tool``, checking that it carries ``keys``."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise CursorError("malformed cursor")
+    if not isinstance(state, dict):
+        raise CursorError("malformed cursor")
+    if state.get("tool") != tool:
+        raise CursorError(f"the cursor was issued by {state.get('tool')}, not {tool}")
+    if any(key not in state for key in keys):
+        raise CursorError("malformed cursor")
+    return state
+
+
+def check_cursor_types(state: Dict[str, Any], **types: type) -> None:
+    """Check the types of decoded cursor fields, raising CursorError on a mismatch."""
+    for key, expected in types.items():
+        value = state.get(key)
+        # bool is a subclass of int, but never a valid position or checksum
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise CursorError("malformed cursor")
+
+
+def text_digest(text: str) -> int:
+    """Return a checksum of a tool result, to detect that it changed between calls."""
+    return zlib.crc32(text.encode())
+
+
+def continuation_note(tool: str, cursor: str, max_chars: int) -> str:
+    """Return the note ending output that was cut at the budget."""
+    return f"\n[Output truncated at {max_chars} characters. Call {tool} with cursor=\"{cursor}\" to continue.]\n"
+
+
+def slice_text(text: str, offset: int, max_chars: int) -> Tuple[str, Optional[int]]:
+    """Return up to ``max_chars`` of ``text`` from ``offset`` and where the next slice starts.
+
+    Slices end at a line break when one falls within the budget. The next
+    offset is None once the end of the text is reached.
+    """
+    end = offset + max_chars
+    if end >= len(text):
+        return text[offset:], None
+    newline = text.rfind("\n", offset, end)
+    if newline != -1:
+        end = newline + 1
+    return text[offset:end], end
+
+
+def take_lines(
+    lines: List[str], start: Position, room: int, max_chars: int
+) -> Tuple[str, Optional[Position]]:
+    """Take whole lines from ``start`` while they fit in ``room`` characters.
+
+    Lines are returned as text, each followed by a line break. A line longer
+    than the whole budget (``max_chars``) is split, without a line break after
+    the first part, so every continuation makes progress and consecutive
+    outputs join up exactly. Returns the text taken and the position to
+    continue from, or None when every line was taken.
+    """
+    index, offset = start
+    taken = []
+    while index < len(lines):
+        line = lines[index][offset:] if offset else lines[index]
+        if len(line) + 1 <= room:
+            taken.append(line)
+            taken.append("\n")
+            room -= len(line) + 1
+            index, offset = index + 1, 0
+            continue
+        if len(line) + 1 > max_chars and room > 0:
+            taken.append(line[:room])
+            offset += room
+        return "".join(taken), (index, offset)
+    return "".join(taken), None
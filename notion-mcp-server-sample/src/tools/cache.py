@@ -0,0 +1,122 @@
+"""
+Bounded in-process cache for Notion responses.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def make_key(endpoint: str, **params: Any) -> Tuple[str, str]:
+    """Build a cache key from an endpoint name and its normalized arguments."""
+    return (endpoint, json.dumps(params, sort_keys=True, default=str))
+
+
+def estimate_size(value: Any) -> int:
+    """Roughly estimate the memory taken by a cached value, in bytes."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value) + 8 * len(value)
+    if isinstance(value, dict):
+        return len(json.dumps(value, default=str))
+    if hasattr(value, "__slots__"):
+        # Compact records (see models.py)
+        return sum(estimate_size(getattr(value, name)) for name in value.__slots__) + 8 * len(value.__slots__)
+    return 64
+
+
+class _CacheEntry:
+    """A cached value with its expiry time and estimated size."""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class ResponseCache:
+    """LRU cache with per-entry TTLs, bounded by entry count and total size."""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 50_000_000):
+        """Initialize an empty cache. A ``max_entries`` of 0 disables caching."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh cached value, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: Optional[int] = None) -> None:
+        """Store a value for ``ttl`` seconds, evicting least recently used entries."""
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = _CacheEntry(value, time.monotonic() + ttl, size)
+        self.total_bytes += size
+
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry and release its size."""
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
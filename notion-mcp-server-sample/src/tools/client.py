@@ -0,0 +1,70 @@
+"""
+Shared asynchronous Notion client.
+"""
+
+import logging
+from typing import Any, Optional
+
+import httpx
+from notion_client import AsyncClient
+
+from src.config import settings
+from src.tools.metrics import get_metrics
+
+
+logger = logging.getLogger(__name__)
+
+# One client (and one HTTP connection pool) for the whole process
+_client: Optional[AsyncClient] = None
+
+
+def get_notion_client() -> Optional[AsyncClient]:
+    """Return the process-wide async Notion client, creating it on first use."""
+    global _client
+
+    if _client is None:
+        if not settings.notion_api_key:
+            return None
+
+        event_hooks = {"response": [_count_response_bytes]} if get_metrics().enabled else {}
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.notion_max_connections,
+                max_keepalive_connections=settings.notion_max_connections,
+            ),
+            event_hooks=event_hooks,
+        )
+        _client = AsyncClient(
+            auth=settings.notion_api_key,
+            notion_version=settings.notion_version,
+            base_url=settings.notion_base_url,
+            timeout_ms=settings.notion_timeout_ms,
+            client=http_client,
+        )
+        logger.info(
+            f"Created Notion client (max connections: {settings.notion_max_connections})"
+        )
+
+    return _client
+
+
+async def _count_response_bytes(response: httpx.Response) -> None:
+    """Record the size of a Notion response body as received over the wire."""
+    # The Notion client reads every body in full anyway
+    await response.aread()
+    # Bodies that were not streamed (already in memory) report no downloaded bytes
+    get_metrics().add_bytes(response.num_bytes_downloaded or len(response.content))
+
+
+async def close_notion_client() -> None:
+    """Close the shared Notion client and its connection pool."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def endpoint_name(func: Any) -> str:
+    """Return a readable name for a Notion endpoint method, such as ``PagesEndpoint.retrieve``."""
+    return getattr(func, "__qualname__", None) or type(func).__qualname__
@@ -0,0 +1,216 @@
+"""
+In-process metrics for tool calls and Notion requests.
+"""
+
+import bisect
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config import settings
+
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Upper bounds of the "Notion requests per tool call" histogram buckets
+REQUEST_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Cumulative bucketed histogram, in the Prometheus style."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """Initialize an empty histogram with the given bucket upper bounds."""
+        self.buckets = buckets
+        # One extra bucket for values above the last bound (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class CallRecord:
+    """Notion traffic caused by one tool call."""
+
+    __slots__ = ("requests", "bytes")
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+
+
+# The tool call the current task works for; tasks spawned by a call inherit it
+_current_call: "contextvars.ContextVar[Optional[CallRecord]]" = contextvars.ContextVar(
+    "current_call", default=None
+)
+
+
+class Metrics:
+    """Latency histograms and counters for tool calls and Notion requests.
+
+    Callers check ``enabled`` before recording anything, so disabled metrics
+    cost one attribute lookup per call site.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """Initialize empty metrics."""
+        self.enabled = enabled
+        self.started = time.time()
+        self.tool_latency: Dict[str, Histogram] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.tool_requests: Dict[str, Histogram] = {}
+        self.tool_bytes: Dict[str, int] = {}
+        self.endpoint_latency: Dict[str, Histogram] = {}
+        self.endpoint_errors: Dict[str, int] = {}
+        self.rate_limit_wait = Histogram()
+        self.bytes_received = 0
+        self.tools_in_flight = 0
+        self.tools_in_flight_peak = 0
+        self.requests_in_flight = 0
+        self.requests_in_flight_peak = 0
+
+    @contextmanager
+    def tool_call(self, name: str) -> Iterator[None]:
+        """Time a tool call and attribute the Notion requests it makes to it."""
+        record = CallRecord()
+        token = _current_call.set(record)
+        self.tools_in_flight += 1
+        self.tools_in_flight_peak = max(self.tools_in_flight_peak, self.tools_in_flight)
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.tool_errors[name] = self.tool_errors.get(name, 0) + 1
+            raise
+        finally:
+            _observe(self.tool_latency, name, time.perf_counter() - started)
+            _observe(self.tool_requests, name, record.requests, REQUEST_COUNT_BUCKETS)
+            self.tool_bytes[name] = self.tool_bytes.get(name, 0) + record.bytes
+            self.tools_in_flight -= 1
+            _current_call.reset(token)
+
+    @contextmanager
+    def request(self, endpoint: str) -> Iterator[None]:
+        """Time one attempt of a Notion request."""
+        record = _current_call.get()
+        if record is not None:
+            record.requests += 1
+        self.requests_in_flight += 1
+        self.requests_in_flight_peak = max(self.requests_in_flight_peak, self.requests_in_flight)
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.endpoint_errors[endpoint] = self.endpoint_errors.get(endpoint, 0) + 1
+            raise
+        finally:
+            _observe(self.endpoint_latency, endpoint, time.perf_counter() - started)
+            self.requests_in_flight -= 1
+
+    def add_bytes(self, size: int) -> None:
+        """Count bytes received from the Notion API."""
+        self.bytes_received += size
+        record = _current_call.get()
+        if record is not None:
+            record.bytes += size
+
+    def render_prometheus(self, gauges: Dict[str, float]) -> str:
+        """Render the metrics, plus extra gauges and counters, in Prometheus text format."""
+        lines: List[str] = []
+        _histogram_lines(lines, "notion_mcp_tool_duration_seconds", "tool", self.tool_latency)
+        _histogram_lines(lines, "notion_mcp_tool_notion_requests", "tool", self.tool_requests)
+        _histogram_lines(lines, "notion_mcp_notion_request_duration_seconds", "endpoint", self.endpoint_latency)
+        _histogram_lines(lines, "notion_mcp_rate_limit_wait_seconds", None, {"": self.rate_limit_wait})
+        _counter_lines(lines, "notion_mcp_tool_errors_total", "tool", self.tool_errors)
+        _counter_lines(lines, "notion_mcp_tool_received_bytes_total", "tool", self.tool_bytes)
+        _counter_lines(lines, "notion_mcp_notion_request_errors_total", "endpoint", self.endpoint_errors)
+
+        values = {
+            "notion_mcp_received_bytes_total": self.bytes_received,
+            "notion_mcp_tools_in_flight": self.tools_in_flight,
+            "notion_mcp_tools_in_flight_peak": self.tools_in_flight_peak,
+            "notion_mcp_notion_requests_in_flight": self.requests_in_flight,
+            "notion_mcp_notion_requests_in_flight_peak": self.requests_in_flight_peak,
+            "notion_mcp_uptime_seconds": time.time() - self.started,
+        }
+        values.update(gauges)
+        for name, value in values.items():
+            lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _observe(
+    histograms: Dict[str, Histogram],
+    label: str,
+    value: float,
+    buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+) -> None:
+    """Record a value in the histogram for ``label``, creating it on first use."""
+    histogram = histograms.get(label)
+    if histogram is None:
+        histogram = histograms[label] = Histogram(buckets)
+    histogram.observe(value)
+
+
+def _label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(
+    lines: List[str], name: str, label: Optional[str], histograms: Dict[str, Histogram]
+) -> None:
+    """Append a histogram family in Prometheus text format."""
+    lines.append(f"# TYPE {name} histogram")
+    for value, histogram in sorted(histograms.items()):
+        labels = f'{label}="{_label_value(value)}",' if label else ""
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {histogram.count}')
+        selector = f"{{{labels.rstrip(',')}}}" if label else ""
+        lines.append(f"{name}_sum{selector} {histogram.sum}")
+        lines.append(f"{name}_count{selector} {histogram.count}")
+
+
+def _counter_lines(lines: List[str], name: str, label: str, counters: Dict[str, Any]) -> None:
+    """Append a labelled counter family in Prometheus text format."""
+    lines.append(f"# TYPE {name} counter")
+    for value, count in sorted(counters.items()):
+        lines.append(f'{name}{{{label}="{_label_value(value)}"}} {count}')
+
+
+# One set of metrics for the whole process
+_metrics: Optional[Metrics] = None
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics."""
+    global _metrics
+
+    if _metrics is None:
+        _metrics = Metrics(enabled=settings.metrics_enabled)
+    return _metrics
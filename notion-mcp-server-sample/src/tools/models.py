@@ -0,0 +1,200 @@
+"""
+Compact in-memory records for Notion blocks and pages.
+"""
+
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Block and property type names repeat across every tree; one copy of each is kept
+intern = sys.intern
+
+
+def extract_rich_text(rich_text_list: List[Dict[str, Any]]) -> str:
+    """Extract plain text from rich text objects, including mentions and equations."""
+    try:
+        # API responses always carry plain_text; most blocks hold a single run
+        if len(rich_text_list) == 1:
+            return rich_text_list[0]["plain_text"]
+        return "".join([text_obj["plain_text"] for text_obj in rich_text_list])
+    except KeyError:
+        pass
+
+    text_parts = []
+    for text_obj in rich_text_list:
+        if "plain_text" in text_obj:
+            text_parts.append(text_obj["plain_text"])
+        elif "text" in text_obj and "content" in text_obj["text"]:
+            text_parts.append(text_obj["text"]["content"])
+    return "".join(text_parts)
+
+
+class Block:
+    """A block reduced to what rendering and indexing use.
+
+    Rich text is flattened to plain text once, when the block is ingested,
+    and the type-specific content is reduced to one ``extra`` value (a
+    to-do's checked state, a code block's language, a link's URL, ...).
+    Timestamps, authors, annotations and parent references are dropped.
+    """
+
+    __slots__ = ("id", "type", "text", "extra", "has_children", "children", "children_error")
+
+    def __init__(
+        self,
+        id: str,
+        type: str,
+        text: str = "",
+        extra: Any = None,
+        has_children: bool = False,
+        children: Optional[List["Block"]] = None,
+        children_error: Optional[str] = None,
+    ):
+        self.id = id
+        self.type = type
+        self.text = text
+        self.extra = extra
+        self.has_children = has_children
+        # Fetched children, or None when they were not fetched
+        self.children = children
+        self.children_error = children_error
+
+    @classmethod
+    def from_api(cls, block: Dict[str, Any]) -> "Block":
+        """Build a block from a Notion API block object (with fetched ``children``, if any)."""
+        block_type = block.get("type", "unknown")
+        content = block.get(block_type) or {}
+        text, extra = INGESTERS.get(block_type, _rich_text)(content)
+        children = block.get("children")
+        return cls(
+            block["id"],
+            intern(block_type),
+            text,
+            extra,
+            block.get("has_children", False),
+            blocks_from_api(children) if children is not None else None,
+            block.get("children_error"),
+        )
+
+    def to_row(self) -> List[Any]:
+        """Serialize the block and its subtree as a JSON-friendly list."""
+        children = [child.to_row() for child in self.children] if self.children is not None else None
+        return [self.id, self.type, self.text, self.extra, self.has_children, children, self.children_error]
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "Block":
+        """Rebuild a block and its subtree from ``to_row`` output."""
+        block_id, block_type, text, extra, has_children, children, children_error = row
+        if isinstance(extra, list):
+            extra = tuple(extra)
+        return cls(
+            block_id,
+            intern(block_type),
+            text,
+            extra,
+            has_children,
+            [cls.from_row(child) for child in children] if children is not None else None,
+            children_error,
+        )
+
+
+def blocks_from_api(blocks: List[Dict[str, Any]]) -> List[Block]:
+    """Convert a list of Notion API block objects."""
+    return [Block.from_api(block) for block in blocks]
+
+
+def blocks_from_rows(rows: List[Any]) -> List[Block]:
+    """Convert stored rows back to blocks, accepting trees stored as raw API objects too."""
+    if rows and isinstance(rows[0], dict):
+        return blocks_from_api(rows)
+    return [Block.from_row(row) for row in rows]
+
+
+# An ingester reduces a block's type-specific content to ``(text, extra)``
+Ingester = Callable[[Dict[str, Any]], Tuple[str, Any]]
+
+
+def _rich_text(content: Dict[str, Any]) -> Tuple[str, Any]:
+    return extract_rich_text(content.get("rich_text", [])), None
+
+
+def _caption(content: Dict[str, Any]) -> str:
+    return extract_rich_text(content.get("caption", []))
+
+
+def _file_url(content: Dict[str, Any]) -> str:
+    """Return the URL of a Notion file object (hosted or external)."""
+    file_type = content.get("type", "external")
+    return (content.get(file_type) or {}).get("url", "")
+
+
+def _icon_emoji(content: Dict[str, Any]) -> str:
+    return (content.get("icon") or {}).get("emoji", "")
+
+
+def _synced_from(content: Dict[str, Any]) -> Optional[str]:
+    return (content.get("synced_from") or {}).get("block_id")
+
+
+def _link_target(content: Dict[str, Any]) -> Tuple[str, Any]:
+    target_type = content.get("type", "page_id")
+    return content.get(target_type, ""), intern(target_type)
+
+
+INGESTERS: Dict[str, Ingester] = {
+    "to_do": lambda content: (extract_rich_text(content.get("rich_text", [])), bool(content.get("checked", False))),
+    "code": lambda content: (extract_rich_text(content.get("rich_text", [])), intern(content.get("language", ""))),
+    "callout": lambda content: (extract_rich_text(content.get("rich_text", [])), _icon_emoji(content)),
+    "equation": lambda content: (content.get("expression", ""), None),
+    "image": lambda content: (_caption(content), _file_url(content)),
+    "child_page": lambda content: (content.get("title", "Untitled"), None),
+    "child_database": lambda content: (content.get("title", "Untitled"), None),
+    "link_to_page": _link_target,
+    "table": lambda content: ("", content.get("table_width")),
+    "table_row": lambda content: ("", tuple(extract_rich_text(cell) for cell in content.get("cells", []))),
+    "synced_block": lambda content: ("", _synced_from(content)),
+}
+for _media_type in ("video", "audio", "pdf", "file"):
+    INGESTERS[_media_type] = lambda content: (_caption(content) or content.get("name") or "", _file_url(content))
+for _link_type in ("bookmark", "embed", "link_preview"):
+    INGESTERS[_link_type] = lambda content: (_caption(content), content.get("url", ""))
+
+
+class Page:
+    """The fields of a page object used to describe it, without its properties."""
+
+    __slots__ = ("id", "title", "url", "created_time", "last_edited_time", "archived")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        url: str,
+        created_time: str,
+        last_edited_time: str,
+        archived: bool = False,
+    ):
+        self.id = id
+        self.title = title
+        self.url = url
+        self.created_time = created_time
+        self.last_edited_time = last_edited_time
+        self.archived = archived
+
+    @classmethod
+    def from_api(cls, page: Dict[str, Any]) -> "Page":
+        """Build a page from a Notion API page object."""
+        title = "Untitled"
+        for prop in page.get("properties", {}).values():
+            if prop.get("type") == "title":
+                title = extract_rich_text(prop.get("title", [])) or "Untitled"
+                break
+        return cls(
+            page["id"],
+            title,
+            page["url"],
+            # Pages created or edited in the same minute share timestamps
+            intern(page["created_time"]),
+            intern(page["last_edited_time"]),
+            page.get("archived", False),
+        )
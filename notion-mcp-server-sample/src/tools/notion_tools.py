@@ -2,14 +2,58 @@
 Notion API tools for MCP server.
 """
 
+import asyncio
+import inspect
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import sqlite3
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 
-from notion_client import Client
+from notion_client import AsyncClient
 from notion_client.errors import APIResponseError, RequestTimeoutError
 
 from src.config import settings
+from src.tools.aggregate import Aggregation
+from src.tools.block_fetcher import BlockTreeFetcher, SyncedSources
+from src.tools.budget import (
+    CursorError,
+    check_cursor_types,
+    continuation_note,
+    decode_cursor,
+    encode_cursor,
+    slice_text,
+    take_lines,
+    text_digest,
+)
+from src.tools.cache import ResponseCache, make_key
+from src.tools.client import endpoint_name, get_notion_client
+from src.tools.pagination import paginate
+from src.tools.rate_limit import INTERACTIVE, get_rate_limiter
+from src.tools.metrics import Histogram, get_metrics
+from src.tools.models import Block, Page
+from src.tools.offload import RenderPool
+from src.tools.properties import (
+    DEFAULT_COMPACT_FIELDS,
+    SEARCH_COMPACT_FIELDS,
+    compact_header,
+    compact_record,
+    property_lines,
+    relation_ids,
+    with_relation_titles,
+)
+from src.tools.renderers import (
+    collect_block_text,
+    count_blocks,
+    extract_rich_text,
+    render_block,
+    render_block_lines,
+)
+from src.tools.rendering import TextWriter
+from src.tools.search_index import SearchIndex
+from src.tools.single_flight import SingleFlight
+from src.tools.store import PageStore, normalize_id
 
 
 logger = logging.getLogger(__name__)
@@ -19,15 +63,48 @@ class NotionTools:
     """Tools for interacting with Notion API."""
 
     def __init__(self):
-        """Initialize Notion client."""
+        """Initialize the tools; the Notion client is created on first use."""
         if not settings.notion_api_key:
             logger.warning("Notion API key not configured")
-            self.client = None
-        else:
-            self.client = Client(
-                auth=settings.notion_api_key,
-                notion_version=settings.notion_version,
-            )
+        
+        self.cache = ResponseCache(
+            max_entries=settings.cache_max_entries if settings.cache_enabled else 0,
+            max_bytes=settings.cache_max_bytes,
+        )
+        self.store = PageStore(settings.page_store_path) if settings.page_store_path else None
+        self.index = SearchIndex(self.store) if self.store else None
+        self._index_checked = False
+        self.limiter = get_rate_limiter()
+        self.flights = SingleFlight()
+        self.render_pool = RenderPool(settings.render_workers, settings.render_offload_min_blocks)
+
+    @property
+    def client(self) -> Optional[AsyncClient]:
+        """Return the shared Notion client, creating it (and its HTTP pool) on first use."""
+        return get_notion_client()
+
+    async def close(self) -> None:
+        """Release resources held by the tools."""
+        self.render_pool.close()
+        if self.store:
+            await self.store.close()
+
+    async def _request(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        priority: int = INTERACTIVE,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a Notion API request through the shared rate limiter.
+
+        Identical requests (same endpoint and arguments) that are already in
+        flight are joined instead of being sent again.
+        """
+        key = make_key(endpoint_name(func), args=args, **kwargs)
+        return await self.flights.do(
+            key, partial(self.limiter.call, func, *args, priority=priority, **kwargs)
+        )
 
     def _check_client(self) -> None:
         """Check if Notion client is initialized."""
@@ -36,131 +113,90 @@ class NotionTools:
                 "Notion API key not configured. Please set NOTION_API_KEY environment variable."
             )
 
-    def _format_page_info(self, page: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_page_info(self, page: Dict[str, Any]) -> Page:
         """Format page information for display."""
-        title = "Untitled"
-        
-        # Extract title from properties
-        if "properties" in page:
-            for prop_name, prop_value in page["properties"].items():
-                if prop_value.get("type") == "title" and prop_value.get("title"):
-                    title_parts = []
-                    for text_obj in prop_value["title"]:
-                        if "text" in text_obj and "content" in text_obj["text"]:
-                            title_parts.append(text_obj["text"]["content"])
-                    if title_parts:
-                        title = "".join(title_parts)
-                    break
+        return Page.from_api(page)
 
-        return {
-            "id": page["id"],
-            "title": title,
-            "url": page["url"],
-            "created_time": page["created_time"],
-            "last_edited_time": page["last_edited_time"],
-            "archived": page.get("archived", False),
-            "properties": page.get("properties", {}),
-        }
-
-    def _format_block_content(self, block: Dict[str, Any], level: int = 0) -> str:
-        """Format block content for display."""
-        indent = "  " * level
-        block_type = block.get("type", "unknown")
-        
-        if block_type == "paragraph":
-            text = self._extract_rich_text(block.get("paragraph", {}).get("rich_text", []))
-            return f"{indent}• {text}" if text else ""
-        
-        elif block_type == "heading_1":
-            text = self._extract_rich_text(block.get("heading_1", {}).get("rich_text", []))
-            return f"{indent}# {text}"
-        
-        elif block_type == "heading_2":
-            text = self._extract_rich_text(block.get("heading_2", {}).get("rich_text", []))
-            return f"{indent}## {text}"
-        
-        elif block_type == "heading_3":
-            text = self._extract_rich_text(block.get("heading_3", {}).get("rich_text", []))
-            return f"{indent}### {text}"
-        
-        elif block_type == "bulleted_list_item":
-            text = self._extract_rich_text(block.get("bulleted_list_item", {}).get("rich_text", []))
-            return f"{indent}- {text}"
-        
-        elif block_type == "numbered_list_item":
-            text = self._extract_rich_text(block.get("numbered_list_item", {}).get("rich_text", []))
-            return f"{indent}1. {text}"
-        
-        elif block_type == "to_do":
-            text = self._extract_rich_text(block.get("to_do", {}).get("rich_text", []))
-            checked = block.get("to_do", {}).get("checked", False)
-            checkbox = "[x]" if checked else "[ ]"
-            return f"{indent}{checkbox} {text}"
-        
-        elif block_type == "toggle":
-            text = self._extract_rich_text(block.get("toggle", {}).get("rich_text", []))
-            return f"{indent}▼ {text}"
-        
-        elif block_type == "quote":
-            text = self._extract_rich_text(block.get("quote", {}).get("rich_text", []))
-            return f"{indent}> {text}"
-        
-        elif block_type == "code":
-            language = block.get("code", {}).get("language", "")
-            text = self._extract_rich_text(block.get("code", {}).get("rich_text", []))
-            return f"{indent}```{language}\n{text}\n{indent}```"
-        
-        elif block_type == "divider":
-            return f"{indent}---"
-        
-        else:
-            return f"{indent}[{block_type.upper()}]"
+    # Blocks are rendered through the renderer registry (see renderers.py)
+    _format_block_content = staticmethod(render_block)
 
     def _extract_rich_text(self, rich_text_list: List[Dict[str, Any]]) -> str:
         """Extract plain text from rich text objects."""
-        text_parts = []
-        for text_obj in rich_text_list:
-            if "text" in text_obj and "content" in text_obj["text"]:
-                text_parts.append(text_obj["text"]["content"])
-        return "".join(text_parts)
+        return extract_rich_text(rich_text_list)
 
-    async def get_notion_pages(self, query: Optional[str] = None, page_size: int = 10) -> str:
+    async def get_notion_pages(
+        self,
+        query: Optional[str] = None,
+        page_size: int = 10,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+        max_chars: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
         """Get pages from Notion workspace."""
+        args = {
+            "query": query,
+            "page_size": page_size,
+            "limit": limit,
+            "fields": fields,
+            "output_format": output_format,
+        }
+        return await self._budgeted("get_notion_pages", self._get_notion_pages, args, max_chars, cursor)
+
+    async def _get_notion_pages(
+        self,
+        query: Optional[str] = None,
+        page_size: int = 10,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+    ) -> str:
+        """Render the pages of the workspace, served from cache for a short TTL."""
         self._check_client()
         
+        cache_key = make_key(
+            "get_notion_pages", query=query, limit=limit or page_size, fields=fields, format=output_format
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
+            search_params = {"filter": {"property": "object", "value": "page"}}
             if query:
                 # Use search API if query is provided
-                response = self.client.search(
-                    query=query,
-                    page_size=min(page_size, 100),
-                    filter={"property": "object", "value": "page"}
-                )
-            else:
-                # Use search without query to get all pages
-                response = self.client.search(
-                    page_size=min(page_size, 100),
-                    filter={"property": "object", "value": "page"}
-                )
-            
-            pages = response.get("results", [])
-            
-            if not pages:
-                return "No pages found."
+                search_params["query"] = query
             
-            result = f"Found {len(pages)} page(s):\n\n"
+            count = 0
+            output = TextWriter()
             
-            for i, page in enumerate(pages, 1):
+            search = partial(self._request, self.client.search)
+            async for page in paginate(search, limit=limit or page_size, **search_params):
+                count += 1
+                if output_format != "markdown":
+                    output.write(compact_record(page, fields or DEFAULT_COMPACT_FIELDS, output_format))
+                    continue
                 page_info = self._format_page_info(page)
-                result += f"{i}. **{page_info['title']}**\n"
-                result += f"   - ID: {page_info['id']}\n"
-                result += f"   - URL: {page_info['url']}\n"
-                result += f"   - Created: {page_info['created_time']}\n"
-                result += f"   - Last edited: {page_info['last_edited_time']}\n"
-                if page_info['archived']:
-                    result += f"   - Status: Archived\n"
-                result += "\n"
+                output.write(f"{count}. **{page_info.title}**\n")
+                output.write(f"   - ID: {page_info.id}\n")
+                output.write(f"   - URL: {page_info.url}\n")
+                output.write(f"   - Created: {page_info.created_time}\n")
+                output.write(f"   - Last edited: {page_info.last_edited_time}\n")
+                if page_info.archived:
+                    output.write(f"   - Status: Archived\n")
+                if fields:
+                    output.write_lines(property_lines(page, fields))
+                output.write("\n")
             
+            if not count:
+                result = "No pages found."
+            elif output_format != "markdown":
+                result = output.getvalue(header=compact_header(fields or DEFAULT_COMPACT_FIELDS, output_format))
+            else:
+                result = output.getvalue(header=f"Found {count} page(s):\n\n")
+            
+            self.cache.set(cache_key, result, ttl=settings.cache_search_ttl)
             return result
             
         except APIResponseError as e:
@@ -170,33 +206,33 @@ class NotionTools:
             logger.error(f"Unexpected error: {e}")
             return f"Unexpected error: {e}"
 
-    async def get_page_content(self, page_id: str, include_children: bool = True) -> str:
-        """Get content from a specific Notion page."""
+    async def get_page_content(
+        self,
+        page_id: str,
+        include_children: bool = True,
+        max_chars: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
+        """Get content from a specific Notion page.
+
+        Content beyond ``max_chars`` is left for later calls: the output ends
+        with a cursor which continues it where it stopped, from the rendered
+        page kept in the cache (or the page store).
+        """
         self._check_client()
         
         try:
-            # First, get the page information
-            page = self.client.pages.retrieve(page_id)
-            page_info = self._format_page_info(page)
-            
-            result = f"**{page_info['title']}**\n"
-            result += f"URL: {page_info['url']}\n"
-            result += f"Created: {page_info['created_time']}\n"
-            result += f"Last edited: {page_info['last_edited_time']}\n\n"
-            
-            # Get page content (blocks)
-            blocks = self._get_page_blocks(page_id, include_children)
-            
-            if blocks:
-                result += "**Content:**\n\n"
-                for block_text in blocks:
-                    if block_text.strip():
-                        result += block_text + "\n"
-            else:
-                result += "This page has no content blocks."
-            
-            return result
+            start = None
+            if cursor:
+                start = decode_cursor(cursor, "get_page_content", "page_id", "include_children", "version", "line", "char")
+                check_cursor_types(start, page_id=str, include_children=bool, version=str, line=int, char=int)
+                page_id, include_children = start["page_id"], start["include_children"]
+            return await self._render_page_content(
+                page_id, include_children, max_chars=self._output_budget(max_chars), start=start
+            )
             
+        except CursorError as e:
+            return f"Cannot continue from cursor: {e}"
         except APIResponseError as e:
             logger.error(f"Notion API error: {e}")
             return f"Error accessing Notion API: {e}"
@@ -204,23 +240,184 @@ class NotionTools:
             logger.error(f"Unexpected error: {e}")
             return f"Unexpected error: {e}"
 
-    def _get_page_blocks(self, page_id: str, include_children: bool = True, level: int = 0) -> List[str]:
-        """Recursively get all blocks from a page."""
+    async def _render_page_content(
+        self,
+        page_id: str,
+        include_children: bool = True,
+        synced_sources: Optional[SyncedSources] = None,
+        max_chars: int = 0,
+        start: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Render a page's details and content blocks.
+
+        With a ``max_chars`` budget, output stops at the budget and ends with
+        a continuation cursor. ``start`` is the decoded cursor of a previous
+        call; the page details are then not repeated.
+        """
+        # First, get the page information
+        page_info = await self._retrieve_page(page_id)
+        if start and start["version"] != page_info.last_edited_time:
+            raise CursorError("the page was edited after the cursor was issued; read it again without a cursor")
+        
+        output = TextWriter()
+        if not start:
+            output.write(f"**{page_info.title}**\n")
+            output.write(f"URL: {page_info.url}\n")
+            output.write(f"Created: {page_info.created_time}\n")
+            output.write(f"Last edited: {page_info.last_edited_time}\n\n")
+        
+        # Get page content (blocks)
+        blocks = await self._get_page_blocks(
+            page_id, include_children, page=page_info, synced_sources=synced_sources
+        )
+        
+        if not blocks:
+            output.write("This page has no content blocks.")
+            return output.getvalue()
+        
+        if not start:
+            output.write("**Content:**\n\n")
+        if not max_chars:
+            output.write_lines(block_text for block_text in blocks if block_text.strip())
+            return output.getvalue()
+        
+        lines = [block_text for block_text in blocks if block_text.strip()]
+        position = (start["line"], start["char"]) if start else (0, 0)
+        text, position = take_lines(lines, position, max_chars - output.size, max_chars)
+        output.write(text)
+        if position is not None:
+            cursor = encode_cursor(
+                "get_page_content",
+                page_id=page_id,
+                include_children=include_children,
+                version=page_info.last_edited_time,
+                line=position[0],
+                char=position[1],
+            )
+            output.write(continuation_note("get_page_content", cursor, max_chars))
+        return output.getvalue()
+
+    def _output_budget(self, max_chars: Optional[int]) -> int:
+        """Return the character budget of a call (0 for none)."""
+        return settings.output_max_chars if max_chars is None else max_chars
+
+    async def _budgeted(
+        self,
+        tool: str,
+        render: Callable[..., Awaitable[str]],
+        args: Dict[str, Any],
+        max_chars: Optional[int],
+        cursor: Optional[str],
+    ) -> str:
+        """Return the part of a listing's output that fits in the call's budget.
+
+        The listing is rendered (or served from cache) in full and sliced; a
+        cursor carries the listing's arguments, the offset reached and a
+        checksum that detects a listing that changed in between.
+        """
+        offset, digest = 0, None
+        if cursor:
+            try:
+                state = decode_cursor(cursor, tool, "args", "offset", "digest")
+                check_cursor_types(state, args=dict, offset=int, digest=int)
+                parameters = inspect.signature(render).parameters
+                if state["offset"] < 0 or any(key not in parameters for key in state["args"]):
+                    raise CursorError("malformed cursor")
+            except CursorError as e:
+                return f"Cannot continue from cursor: {e}"
+            args, offset, digest = state["args"], state["offset"], state["digest"]
+        
+        text = await render(**args)
+        if digest is not None and text_digest(text) != digest:
+            return "Cannot continue from cursor: the results changed since the cursor was issued; list them again"
+        
+        max_chars = self._output_budget(max_chars)
+        if not max_chars:
+            return text[offset:]
+        chunk, next_offset = slice_text(text, offset, max_chars)
+        if next_offset is None:
+            return chunk
+        
+        next_cursor = encode_cursor(
+            tool, args=args, offset=next_offset, digest=text_digest(text) if digest is None else digest
+        )
+        return chunk + continuation_note(tool, next_cursor, max_chars)
+
+    async def _retrieve_page(self, page_id: str) -> Page:
+        """Retrieve a page, served from cache for a short TTL."""
+        cache_key = make_key("pages.retrieve", page_id=page_id)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        page = None
+        if self.store:
+            page = await self.store.get_page(
+                page_id,
+                max_age=settings.cache_page_ttl,
+                sync_max_age=settings.sync_max_age if settings.sync_enabled else None,
+            )
+        if page is None:
+            page = await self._request(self.client.pages.retrieve, page_id)
+            if self.store:
+                await self.store.save_page(page)
+        
+        # Only the compact record is cached, not the page's properties
+        page_info = Page.from_api(page)
+        self.cache.set(cache_key, page_info, ttl=settings.cache_page_ttl)
+        return page_info
+
+    async def _get_page_blocks(
+        self,
+        page_id: str,
+        include_children: bool = True,
+        level: int = 0,
+        page: Optional[Page] = None,
+        synced_sources: Optional[SyncedSources] = None,
+    ) -> List[str]:
+        """Get all blocks from a page, fetching sibling subtrees concurrently.
+
+        When the ``page`` object is given, the rendered blocks are cached (and
+        the block tree persisted, if a page store is configured) and reused for
+        as long as the page reports the same edit time. ``synced_sources`` lets
+        fetches of several pages share synced block sources.
+        """
+        cache_key = make_key("blocks", page_id=page_id, include_children=include_children, level=level)
+        last_edited_time = page.last_edited_time if page else None
+        if last_edited_time:
+            cached = self.cache.get(cache_key)
+            if cached is not None and cached[0] == last_edited_time:
+                return cached[1]
+            
+            if self.store:
+                stored = await self.store.get_block_tree(page_id, include_children)
+                if stored is not None and stored[0] == last_edited_time:
+                    blocks_text = await self.render_pool.run(
+                        count_blocks(stored[1]), render_block_lines, stored[1], level
+                    )
+                    self.cache.set(cache_key, (last_edited_time, blocks_text), ttl=settings.cache_blocks_ttl)
+                    return blocks_text
+        
         blocks_text = []
+        fetcher = self._new_block_fetcher(synced_sources=synced_sources)
         
         try:
-            response = self.client.blocks.children.list(block_id=page_id, page_size=100)
-            blocks = response.get("results", [])
+            blocks = await fetcher.fetch(page_id, include_children)
+            blocks_text.extend(
+                await self.render_pool.run(fetcher.block_count, render_block_lines, blocks, level)
+            )
             
-            for block in blocks:
-                block_text = self._format_block_content(block, level)
-                if block_text:
-                    blocks_text.append(block_text)
-                
-                # If block has children and we want to include them
-                if include_children and block.get("has_children", False):
-                    child_blocks = self._get_page_blocks(block["id"], include_children, level + 1)
-                    blocks_text.extend(child_blocks)
+            if fetcher.truncated:
+                blocks_text.append(
+                    f"[Content truncated: depth limit {fetcher.max_depth} "
+                    f"or block limit {fetcher.max_blocks} reached]"
+                )
+            
+            # Don't keep partial trees around
+            if last_edited_time and not fetcher.errors:
+                self.cache.set(cache_key, (last_edited_time, blocks_text), ttl=settings.cache_blocks_ttl)
+                if self.store and not fetcher.truncated:
+                    await self._persist_block_tree(page, include_children, blocks)
             
         except APIResponseError as e:
             logger.error(f"Error getting blocks for {page_id}: {e}")
@@ -228,45 +425,136 @@ class NotionTools:
         
         return blocks_text
 
-    async def search_notion(self, query: str, filter_options: Optional[Dict] = None, page_size: int = 10) -> str:
+    async def _persist_block_tree(
+        self, page: Page, include_children: bool, blocks: List[Block]
+    ) -> None:
+        """Save a fetched block tree to the page store and refresh the page in the search index."""
+        await self.store.save_block_tree(page.id, include_children, page.last_edited_time, blocks)
+        if include_children:
+            entries = await self.render_pool.run(count_blocks(blocks), collect_block_text, blocks)
+            await self.index.update_page(page.id, page.title, entries)
+
+    async def rebuild_search_index(self) -> int:
+        """Index every block tree in the page store, returning the number of pages indexed."""
+        count = 0
+        for page_id in await self.store.get_block_tree_ids():
+            page = await self.store.get_page(page_id)
+            stored = await self.store.get_block_tree(page_id, True)
+            if page is None or stored is None:
+                continue
+            title = self._format_page_info(page).title
+            entries = await self.render_pool.run(count_blocks(stored[1]), collect_block_text, stored[1])
+            await self.index.update_page(page_id, title, entries)
+            count += 1
+        return count
+
+    def _new_block_fetcher(
+        self,
+        priority: int = INTERACTIVE,
+        synced_sources: Optional[SyncedSources] = None,
+        leaf_types: Tuple[str, ...] = (),
+    ) -> BlockTreeFetcher:
+        """Create a block tree fetcher with the configured limits."""
+        return BlockTreeFetcher(
+            self.client,
+            max_concurrency=settings.block_fetch_concurrency,
+            max_depth=settings.block_fetch_max_depth,
+            max_blocks=settings.block_fetch_max_blocks,
+            request=self._request,
+            priority=priority,
+            synced_sources=synced_sources,
+            leaf_types=leaf_types,
+        )
+
+    async def search_notion(
+        self,
+        query: str,
+        filter_options: Optional[Dict] = None,
+        page_size: int = 10,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+        max_chars: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
         """Search for pages and databases in Notion."""
+        args = {
+            "query": query,
+            "filter_options": filter_options,
+            "page_size": page_size,
+            "limit": limit,
+            "fields": fields,
+            "output_format": output_format,
+        }
+        return await self._budgeted("search_notion", self._search_notion, args, max_chars, cursor)
+
+    async def _search_notion(
+        self,
+        query: str,
+        filter_options: Optional[Dict] = None,
+        page_size: int = 10,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+    ) -> str:
+        """Render search results, served from cache for a short TTL."""
         self._check_client()
         
+        cache_key = make_key(
+            "search",
+            query=query,
+            filter=filter_options,
+            limit=limit or page_size,
+            fields=fields,
+            format=output_format,
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            search_params = {
-                "query": query,
-                "page_size": min(page_size, 100),
-            }
+            search_params = {"query": query}
             
             if filter_options:
                 search_params["filter"] = filter_options
             
-            response = self.client.search(**search_params)
-            results = response.get("results", [])
+            count = 0
+            output = TextWriter()
             
-            if not results:
-                return f"No results found for query: '{query}'"
-            
-            result = f"Found {len(results)} result(s) for '{query}':\n\n"
-            
-            for i, item in enumerate(results, 1):
+            search = partial(self._request, self.client.search)
+            async for item in paginate(search, limit=limit or page_size, **search_params):
+                count += 1
+                if output_format != "markdown":
+                    output.write(compact_record(item, fields or SEARCH_COMPACT_FIELDS, output_format))
+                    continue
                 if item["object"] == "page":
                     page_info = self._format_page_info(item)
-                    result += f"{i}. **[PAGE] {page_info['title']}**\n"
-                    result += f"   - ID: {page_info['id']}\n"
-                    result += f"   - URL: {page_info['url']}\n"
+                    output.write(f"{count}. **[PAGE] {page_info.title}**\n")
+                    output.write(f"   - ID: {page_info.id}\n")
+                    output.write(f"   - URL: {page_info.url}\n")
                 elif item["object"] == "database":
                     title = item.get("title", [])
                     db_title = "Untitled Database"
                     if title:
                         db_title = self._extract_rich_text(title)
-                    result += f"{i}. **[DATABASE] {db_title}**\n"
-                    result += f"   - ID: {item['id']}\n"
-                    result += f"   - URL: {item['url']}\n"
+                    output.write(f"{count}. **[DATABASE] {db_title}**\n")
+                    output.write(f"   - ID: {item['id']}\n")
+                    output.write(f"   - URL: {item['url']}\n")
                 
-                result += f"   - Created: {item['created_time']}\n"
-                result += f"   - Last edited: {item['last_edited_time']}\n\n"
+                output.write(f"   - Created: {item['created_time']}\n")
+                output.write(f"   - Last edited: {item['last_edited_time']}\n")
+                if fields:
+                    output.write_lines(property_lines(item, fields))
+                output.write("\n")
+            
+            if not count:
+                result = f"No results found for query: '{query}'"
+            elif output_format != "markdown":
+                result = output.getvalue(header=compact_header(fields or SEARCH_COMPACT_FIELDS, output_format))
+            else:
+                result = output.getvalue(header=f"Found {count} result(s) for '{query}':\n\n")
             
+            self.cache.set(cache_key, result, ttl=settings.cache_search_ttl)
             return result
             
         except APIResponseError as e:
@@ -281,45 +569,251 @@ class NotionTools:
         database_id: str, 
         page_size: int = 10,
         filter_conditions: Optional[Dict] = None,
-        sorts: Optional[List[Dict]] = None
+        sorts: Optional[List[Dict]] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+        resolve_relations: bool = False,
+        max_chars: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> str:
         """Get pages from a specific Notion database."""
+        args = {
+            "database_id": database_id,
+            "page_size": page_size,
+            "filter_conditions": filter_conditions,
+            "sorts": sorts,
+            "limit": limit,
+            "fields": fields,
+            "output_format": output_format,
+            "resolve_relations": resolve_relations,
+        }
+        return await self._budgeted("get_database_pages", self._get_database_pages, args, max_chars, cursor)
+
+    async def _get_database_pages(
+        self,
+        database_id: str,
+        page_size: int = 10,
+        filter_conditions: Optional[Dict] = None,
+        sorts: Optional[List[Dict]] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+        resolve_relations: bool = False,
+    ) -> str:
+        """Render the pages of a database, reporting errors as text."""
         self._check_client()
         
         try:
-            query_params = {
-                "database_id": database_id,
-                "page_size": min(page_size, 100),
-            }
-            
-            if filter_conditions:
-                query_params["filter"] = filter_conditions
+            return await self._query_database(
+                database_id, page_size, filter_conditions, sorts, limit, fields, output_format, resolve_relations
+            )
             
-            if sorts:
-                query_params["sorts"] = sorts
+        except APIResponseError as e:
+            logger.error(f"Notion API error: {e}")
+            return f"Error accessing database: {e}"
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return f"Unexpected error: {e}"
+
+    async def _query_database(
+        self,
+        database_id: str,
+        page_size: int = 10,
+        filter_conditions: Optional[Dict] = None,
+        sorts: Optional[List[Dict]] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+        resolve_relations: bool = False,
+    ) -> str:
+        """Render the pages of a database, served from cache for a short TTL.
+
+        With ``resolve_relations``, the relation properties listed in
+        ``fields`` show the titles of the pages they point to (see
+        ``_resolve_relations``).
+        """
+        cache_key = self._database_query_key(
+            database_id, page_size, filter_conditions, sorts, limit, fields, output_format, resolve_relations
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        query_params = {"database_id": database_id}
+        
+        if filter_conditions:
+            query_params["filter"] = filter_conditions
+        
+        if sorts:
+            query_params["sorts"] = sorts
+        
+        query = partial(self._request, self.client.databases.query)
+        pages = paginate(query, limit=limit or page_size, **query_params)
+        if resolve_relations and fields:
+            pages = self._resolve_relations(pages, fields)
+        result = await self._render_database_pages(database_id, pages, fields, output_format)
+        
+        self.cache.set(cache_key, result, ttl=settings.cache_database_ttl)
+        return result
+
+    async def _render_database_pages(
+        self,
+        database_id: str,
+        pages: AsyncIterator[Dict[str, Any]],
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+    ) -> str:
+        """Render the pages of a database query as they arrive."""
+        count = 0
+        output = TextWriter()
+        
+        async for page in pages:
+            count += 1
+            if output_format != "markdown":
+                output.write(compact_record(page, fields or DEFAULT_COMPACT_FIELDS, output_format))
+                continue
+            page_info = self._format_page_info(page)
+            output.write(f"{count}. **{page_info.title}**\n")
+            output.write(f"   - ID: {page_info.id}\n")
+            output.write(f"   - URL: {page_info.url}\n")
+            output.write(f"   - Created: {page_info.created_time}\n")
+            output.write(f"   - Last edited: {page_info.last_edited_time}\n")
             
-            response = self.client.databases.query(**query_params)
-            pages = response.get("results", [])
+            if fields:
+                output.write_lines(property_lines(page, fields))
+            elif page.get("properties"):
+                # Without a projection, only summarize the properties
+                output.write(f"   - Properties: {len(page['properties'])} properties\n")
             
-            if not pages:
-                return f"No pages found in database {database_id}"
+            output.write("\n")
+        
+        if not count:
+            return f"No pages found in database {database_id}"
+        if output_format != "markdown":
+            return output.getvalue(header=compact_header(fields or DEFAULT_COMPACT_FIELDS, output_format))
+        return output.getvalue(header=f"Found {count} page(s) in database:\n\n")
+
+    @staticmethod
+    def _database_query_key(
+        database_id: str,
+        page_size: int = 10,
+        filter_conditions: Optional[Dict] = None,
+        sorts: Optional[List[Dict]] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        output_format: str = "markdown",
+        resolve_relations: bool = False,
+    ) -> Tuple[str, str]:
+        """Return the cache key of a rendered database query."""
+        return make_key(
+            "databases.query",
+            database_id=database_id,
+            filter=filter_conditions,
+            sorts=sorts,
+            limit=limit or page_size,
+            fields=fields,
+            format=output_format,
+            relations=resolve_relations,
+        )
+
+    async def _resolve_relations(
+        self, pages: AsyncIterator[Dict[str, Any]], fields: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield query results with the titles of their related pages attached.
+
+        The results are buffered so that every page referenced by the
+        requested relation (or rollup) properties is retrieved once, however
+        many rows point to it. The lookups run concurrently through the rate
+        limiter and reuse cached and stored page metadata.
+        """
+        rows = [page async for page in pages]
+        related: Dict[str, None] = {}
+        for row in rows:
+            properties = row.get("properties", {})
+            for field in fields:
+                if field in properties:
+                    related.update(dict.fromkeys(relation_ids(properties[field])))
+        
+        titles = await self._page_titles(related)
+        for row in rows:
+            yield with_relation_titles(row, fields, titles) if titles else row
+
+    async def _page_titles(self, page_ids: Iterable[str]) -> Dict[str, str]:
+        """Retrieve the titles of distinct pages concurrently, skipping pages that cannot be read."""
+        page_ids = list(page_ids)
+        if len(page_ids) > settings.relation_resolve_max:
+            logger.warning(
+                f"Resolving {settings.relation_resolve_max} of {len(page_ids)} related pages "
+                f"(RELATION_RESOLVE_MAX); the others are shown by ID"
+            )
+            page_ids = page_ids[:settings.relation_resolve_max]
+        
+        async def fetch_title(page_id: str) -> Optional[str]:
+            try:
+                return (await self._retrieve_page(page_id)).title
+            except APIResponseError as e:
+                # Typically a page the integration has no access to
+                logger.debug(f"Could not resolve related page {page_id}: {e}")
+            except Exception as e:
+                logger.warning(f"Could not resolve related page {page_id}: {e}")
+            return None
+        
+        titles = await asyncio.gather(*(fetch_title(page_id) for page_id in page_ids))
+        return {page_id: title for page_id, title in zip(page_ids, titles) if title is not None}
+
+    async def aggregate_database(
+        self,
+        database_id: str,
+        group_by: Optional[str] = None,
+        sum_fields: Optional[List[str]] = None,
+        min_fields: Optional[List[str]] = None,
+        max_fields: Optional[List[str]] = None,
+        distinct_fields: Optional[List[str]] = None,
+        filter_conditions: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        output_format: str = "table",
+    ) -> str:
+        """Aggregate the pages of a database query in one pass without returning the rows."""
+        self._check_client()
+        
+        cache_key = make_key(
+            "databases.aggregate",
+            database_id=database_id,
+            group_by=group_by,
+            sum=sum_fields,
+            min=min_fields,
+            max=max_fields,
+            distinct=distinct_fields,
+            filter=filter_conditions,
+            limit=limit,
+            format=output_format,
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            query_params = {"database_id": database_id}
+            if filter_conditions:
+                query_params["filter"] = filter_conditions
             
-            result = f"Found {len(pages)} page(s) in database:\n\n"
+            aggregation = Aggregation(group_by, sum_fields, min_fields, max_fields, distinct_fields)
+            query = partial(self._request, self.client.databases.query)
+            async for page in paginate(query, limit=limit, **query_params):
+                aggregation.add(page)
             
-            for i, page in enumerate(pages, 1):
-                page_info = self._format_page_info(page)
-                result += f"{i}. **{page_info['title']}**\n"
-                result += f"   - ID: {page_info['id']}\n"
-                result += f"   - URL: {page_info['url']}\n"
-                result += f"   - Created: {page_info['created_time']}\n"
-                result += f"   - Last edited: {page_info['last_edited_time']}\n"
-                
-                # Show some properties
-                if page_info['properties']:
-                    result += f"   - Properties: {len(page_info['properties'])} properties\n"
-                
-                result += "\n"
+            if not aggregation.rows:
+                result = f"No pages found in database {database_id}"
+            elif output_format == "ndjson":
+                result = aggregation.render(output_format)
+            else:
+                result = (
+                    f"Aggregated {aggregation.rows} page(s) into {len(aggregation.groups)} group(s):\n\n"
+                    + aggregation.render(output_format)
+                )
             
+            self.cache.set(cache_key, result, ttl=settings.cache_database_ttl)
             return result
             
         except APIResponseError as e:
@@ -328,3 +822,206 @@ class NotionTools:
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             return f"Unexpected error: {e}"
+
+    async def get_batch(
+        self,
+        page_ids: Optional[List[str]] = None,
+        database_ids: Optional[List[str]] = None,
+        include_children: bool = True,
+        page_size: int = 10,
+        max_chars: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
+        """Fetch the content of several pages and databases concurrently."""
+        args = {
+            "page_ids": page_ids,
+            "database_ids": database_ids,
+            "include_children": include_children,
+            "page_size": page_size,
+        }
+        return await self._budgeted("get_batch", self._get_batch, args, max_chars, cursor)
+
+    async def _get_batch(
+        self,
+        page_ids: Optional[List[str]] = None,
+        database_ids: Optional[List[str]] = None,
+        include_children: bool = True,
+        page_size: int = 10,
+    ) -> str:
+        """Render the content of several pages and databases, fetched concurrently."""
+        self._check_client()
+        
+        items = [("Page", item_id) for item_id in _unique_ids(page_ids)]
+        items.extend(("Database", item_id) for item_id in _unique_ids(database_ids))
+        if not items:
+            return "No page or database IDs given."
+        
+        # Pages in one batch share synced block sources
+        synced_sources: SyncedSources = {}
+        
+        async def fetch_item(kind: str, item_id: str) -> Tuple[bool, str]:
+            try:
+                if kind == "Page":
+                    return True, await self._render_page_content(item_id, include_children, synced_sources)
+                return True, await self._query_database(item_id, page_size)
+            except APIResponseError as e:
+                logger.error(f"Notion API error for {kind.lower()} {item_id}: {e}")
+                return False, f"Error accessing Notion API: {e}"
+            except Exception as e:
+                logger.error(f"Unexpected error for {kind.lower()} {item_id}: {e}")
+                return False, f"Unexpected error: {e}"
+        
+        # Requests from every item share the rate limiter and in-flight deduplication
+        results = await asyncio.gather(*(fetch_item(kind, item_id) for kind, item_id in items))
+        
+        failed = 0
+        output = TextWriter()
+        for (kind, item_id), (ok, text) in zip(items, results):
+            status = ""
+            if not ok:
+                failed += 1
+                status = " (failed)"
+            output.write(f"## {kind} {item_id}{status}\n\n")
+            output.write(text.rstrip("\n"))
+            output.write("\n\n")
+        
+        return output.getvalue(header=f"Fetched {len(items)} item(s), {failed} failed:\n\n")
+
+    async def search_local(self, query: str, limit: int = 10) -> str:
+        """Full-text search over page titles and content in the local mirror."""
+        if not self.index:
+            return "Local search requires PAGE_STORE_PATH to be configured."
+        
+        try:
+            # Index pages mirrored before the index existed
+            if not self._index_checked:
+                if not await self.index.page_count():
+                    indexed = await self.rebuild_search_index()
+                    logger.info(f"Built local search index from {indexed} stored page(s)")
+                self._index_checked = True
+            
+            matches = await self.index.search(query, limit)
+            
+            if not matches:
+                return f"No local matches found for query: '{query}'"
+            
+            output = TextWriter()
+            output.write(f"Found {len(matches)} local match(es) for '{query}':\n\n")
+            
+            for i, match in enumerate(matches, 1):
+                output.write(f"{i}. **{match['page_title']}**\n")
+                output.write(f"   - Page ID: {match['page_id']}\n")
+                if match['block_id']:
+                    output.write(f"   - Block ID: {match['block_id']}\n")
+                output.write(f"   - Match: {match['snippet']}\n\n")
+            
+            return output.getvalue()
+            
+        except sqlite3.Error as e:
+            logger.error(f"Search index error: {e}")
+            return f"Error searching local index: {e}"
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return f"Unexpected error: {e}"
+
+    def _component_stats(self) -> Dict[str, float]:
+        """Return counters of the cache, rate limiter and request deduplication."""
+        cache = self.cache.stats()
+        return {
+            "notion_mcp_cache_hits_total": cache["hits"],
+            "notion_mcp_cache_misses_total": cache["misses"],
+            "notion_mcp_cache_evictions_total": cache["evictions"],
+            "notion_mcp_cache_entries": cache["entries"],
+            "notion_mcp_cache_bytes": cache["bytes"],
+            "notion_mcp_rate_limited_total": self.limiter.rate_limited,
+            "notion_mcp_retries_total": self.limiter.retries,
+            "notion_mcp_rate_limit_per_second": self.limiter.rate,
+            "notion_mcp_deduplicated_requests_total": self.flights.shared,
+            "notion_mcp_render_offloaded_total": self.render_pool.offloaded,
+        }
+
+    def prometheus_metrics(self) -> str:
+        """Return all metrics in Prometheus text format."""
+        return get_metrics().render_prometheus(self._component_stats())
+
+    async def server_stats(self, output_format: str = "text") -> str:
+        """Report latencies, request counts, cache and rate limiter statistics."""
+        if output_format == "prometheus":
+            return self.prometheus_metrics()
+        
+        metrics = get_metrics()
+        cache = self.cache.stats()
+        output = TextWriter()
+        output.write(f"**Server stats** (uptime {time.time() - metrics.started:.0f}s)\n\n")
+        
+        if not metrics.enabled:
+            output.write("Latency metrics are disabled (METRICS_ENABLED=false).\n\n")
+        
+        if metrics.tool_latency:
+            output.write("**Tools:**\n")
+            for name, latency in sorted(metrics.tool_latency.items()):
+                requests = metrics.tool_requests[name]
+                output.write(
+                    f"- {name}: {latency.count} call(s), {metrics.tool_errors.get(name, 0)} error(s), "
+                    f"{_latency_summary(latency)}, "
+                    f"{requests.sum / requests.count:.1f} Notion request(s)/call, "
+                    f"{metrics.tool_bytes.get(name, 0) / 1024:.1f} KB received\n"
+                )
+            output.write("\n")
+        
+        if metrics.endpoint_latency:
+            output.write("**Notion endpoints:**\n")
+            for endpoint, latency in sorted(metrics.endpoint_latency.items()):
+                output.write(
+                    f"- {endpoint}: {latency.count} request(s), "
+                    f"{metrics.endpoint_errors.get(endpoint, 0)} error(s), {_latency_summary(latency)}\n"
+                )
+            output.write("\n")
+        
+        output.write("**Rate limiting:**\n")
+        output.write(f"- Current rate: {self.limiter.rate:.2f} request(s)/s\n")
+        output.write(f"- 429 responses: {self.limiter.rate_limited}, retries: {self.limiter.retries}\n")
+        if metrics.rate_limit_wait.count:
+            output.write(f"- Wait for a token: {_latency_summary(metrics.rate_limit_wait)}\n")
+        output.write(f"- Deduplicated in-flight requests: {self.flights.shared}\n\n")
+        
+        output.write("**Cache:**\n")
+        output.write(
+            f"- {cache['hits']} hit(s), {cache['misses']} miss(es), hit rate {cache['hit_rate']:.0%}\n"
+        )
+        output.write(
+            f"- {cache['entries']} entries, {cache['bytes'] / 1024:.1f} KB, {cache['evictions']} eviction(s)\n\n"
+        )
+        
+        output.write("**Concurrency:**\n")
+        output.write(
+            f"- Tool calls in flight: {metrics.tools_in_flight} (peak {metrics.tools_in_flight_peak})\n"
+        )
+        output.write(
+            f"- Notion requests in flight: {metrics.requests_in_flight} "
+            f"(peak {metrics.requests_in_flight_peak})\n"
+        )
+        output.write(f"- Renders offloaded to workers: {self.render_pool.offloaded}\n")
+        output.write(f"- Received from Notion: {metrics.bytes_received / 1024:.1f} KB\n")
+        
+        return output.getvalue()
+
+
+def _latency_summary(histogram: Histogram) -> str:
+    """Describe a latency histogram by its mean and bucketed percentiles."""
+    return (
+        f"avg {histogram.sum / histogram.count * 1000:.0f}ms, "
+        f"p50 ≤{histogram.quantile(0.5) * 1000:.0f}ms, p95 ≤{histogram.quantile(0.95) * 1000:.0f}ms"
+    )
+
+
+def _unique_ids(ids: Optional[List[str]]) -> List[str]:
+    """Drop repeated IDs (with or without hyphens), keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for item_id in ids or []:
+        key = normalize_id(item_id)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item_id)
+    return unique
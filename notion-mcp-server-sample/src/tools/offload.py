@@ -0,0 +1,48 @@
+"""
+Offloading of CPU-heavy rendering to worker threads.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RenderPool:
+    """Render large block trees on worker threads instead of the event loop.
+
+    Rendering still holds the GIL, but the interpreter hands it back to the
+    event loop every few milliseconds, so other sessions keep being served
+    while a big page renders. Work smaller than ``min_size`` blocks runs
+    inline, where it is cheaper than the hand-off. With no workers,
+    everything runs inline.
+    """
+
+    def __init__(self, workers: int = 2, min_size: int = 2000):
+        """Initialize the pool; threads are started on first use."""
+        self.workers = workers
+        self.min_size = min_size
+        self.offloaded = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, size: int, func: Callable[..., T], *args: Any) -> T:
+        """Call ``func(*args)``, on a worker thread when ``size`` reaches the offload threshold."""
+        if self.workers <= 0 or size < self.min_size:
+            return func(*args)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render")
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def close(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,64 @@
+"""
+Cursor pagination helpers for Notion list endpoints.
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional
+
+
+# Largest page size accepted by the Notion API
+MAX_PAGE_SIZE = 100
+
+
+def _discard_result(task: "asyncio.Future[Any]") -> None:
+    """Retrieve the outcome of an abandoned prefetch so it is not reported as lost."""
+    if not task.cancelled():
+        task.exception()
+
+
+async def paginate(
+    fetch_page: Callable[..., Awaitable[Dict[str, Any]]],
+    limit: Optional[int] = None,
+    page_size: int = MAX_PAGE_SIZE,
+    **kwargs: Any,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """Yield results from a paginated endpoint, following ``next_cursor``.
+
+    ``fetch_page`` is any endpoint method accepting ``start_cursor`` and
+    ``page_size`` (``search``, ``databases.query``, ``blocks.children.list``).
+    The next page is requested as soon as the current one arrives, so it
+    downloads while the caller processes the current results. Iteration stops
+    after ``limit`` results when a limit is given.
+    """
+    remaining = limit
+
+    def request(cursor: Optional[str]) -> "asyncio.Future[Dict[str, Any]]":
+        size = page_size if remaining is None else min(page_size, remaining)
+        params = dict(kwargs, page_size=size)
+        if cursor:
+            params["start_cursor"] = cursor
+        return asyncio.ensure_future(fetch_page(**params))
+
+    pending: Optional["asyncio.Future[Dict[str, Any]]"] = request(None)
+
+    try:
+        while pending is not None:
+            response = await pending
+            pending = None
+
+            results = response.get("results", [])
+            if remaining is not None:
+                results = results[:remaining]
+                remaining -= len(results)
+
+            # Prefetch the next page before handing out the current one
+            next_cursor = response.get("next_cursor")
+            if response.get("has_more") and next_cursor and (remaining is None or remaining > 0):
+                pending = request(next_cursor)
+
+            for item in results:
+                yield item
+    finally:
+        if pending is not None:
+            pending.cancel()
+            pending.add_done_callback(_discard_result)
@@ -0,0 +1,217 @@
+"""
+Typed rendering and projection of Notion page properties.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.tools.models import extract_rich_text
+
+
+PropertyRenderer = Callable[[Any], Any]
+
+PROPERTY_RENDERERS: Dict[str, PropertyRenderer] = {}
+
+# Fields read from the object itself rather than from its properties
+BUILTIN_FIELDS = ("id", "object", "title", "url", "created_time", "last_edited_time", "archived")
+
+# Fields of compact records when no projection is requested
+DEFAULT_COMPACT_FIELDS = ["id", "title", "last_edited_time"]
+SEARCH_COMPACT_FIELDS = ["id", "object", "title", "last_edited_time"]
+
+OUTPUT_FORMATS = ("markdown", "ndjson", "table")
+
+
+def register(*property_types: str) -> Callable[[PropertyRenderer], PropertyRenderer]:
+    """Register a renderer for one or more property types."""
+    def decorator(renderer: PropertyRenderer) -> PropertyRenderer:
+        for property_type in property_types:
+            PROPERTY_RENDERERS[property_type] = renderer
+        return renderer
+    return decorator
+
+
+def property_value(prop: Dict[str, Any]) -> Any:
+    """Return the plain (JSON-serializable) value of a property or formula/rollup result."""
+    prop_type = prop.get("type")
+    renderer = PROPERTY_RENDERERS.get(prop_type)
+    if renderer is None:
+        return None
+    return renderer(prop.get(prop_type))
+
+
+register("title", "rich_text")(lambda value: extract_rich_text(value or []))
+register("number", "checkbox", "url", "email", "phone_number", "created_time", "last_edited_time", "string", "boolean")(
+    lambda value: value
+)
+register("select", "status")(lambda value: value.get("name") if value else None)
+register("multi_select")(lambda value: [option.get("name") for option in value or []])
+register("files")(lambda value: [f.get("name") for f in value or []])
+register("formula")(lambda value: property_value(value) if value else None)
+
+
+@register("relation")
+def render_relation(value: Optional[List[Dict[str, Any]]]) -> List[Any]:
+    """Render related pages by ID, or as ``{id, title}`` once their titles were resolved."""
+    return [
+        {"id": related.get("id"), "title": related["title"]} if "title" in related else related.get("id")
+        for related in value or []
+    ]
+
+
+@register("date")
+def render_date(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Render a date as its start, or as a ``start/end`` ISO interval."""
+    if not value:
+        return None
+    if value.get("end"):
+        return f"{value.get('start')}/{value['end']}"
+    return value.get("start")
+
+
+@register("people", "created_by", "last_edited_by")
+def render_people(value: Any) -> Any:
+    """Render users by name, falling back to their ID."""
+    if isinstance(value, list):
+        return [render_people(user) for user in value]
+    if not value:
+        return None
+    return value.get("name") or value.get("id")
+
+
+@register("rollup")
+def render_rollup(value: Optional[Dict[str, Any]]) -> Any:
+    """Render a rollup's number, date or array of values."""
+    if not value:
+        return None
+    if value.get("type") == "array":
+        return [property_value(item) for item in value.get("array", [])]
+    return property_value(value)
+
+
+@register("unique_id")
+def render_unique_id(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Render a unique ID as ``PREFIX-number``."""
+    if not value:
+        return None
+    prefix = value.get("prefix")
+    return f"{prefix}-{value.get('number')}" if prefix else str(value.get("number"))
+
+
+def object_title(item: Dict[str, Any]) -> str:
+    """Return the title of a page or database."""
+    if item.get("object") == "database":
+        return extract_rich_text(item.get("title", [])) or "Untitled Database"
+    for prop in item.get("properties", {}).values():
+        if prop.get("type") == "title":
+            return extract_rich_text(prop.get("title", [])) or "Untitled"
+    return "Untitled"
+
+
+def project(item: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Extract only the requested fields of a page or database, with typed property values."""
+    properties = item.get("properties", {})
+    record = {}
+    for field in fields:
+        if field == "title":
+            record[field] = object_title(item)
+        elif field in BUILTIN_FIELDS:
+            record[field] = item.get(field)
+        elif field in properties and item.get("object") != "database":
+            record[field] = property_value(properties[field])
+        else:
+            record[field] = None
+    return record
+
+
+def relation_ids(prop: Dict[str, Any]) -> Iterator[str]:
+    """Yield the IDs of the pages a relation property, or a rollup of relations, points to."""
+    prop_type = prop.get("type")
+    if prop_type == "relation":
+        for related in prop.get("relation") or []:
+            if related.get("id"):
+                yield related["id"]
+    elif prop_type == "rollup":
+        for item in (prop.get("rollup") or {}).get("array") or []:
+            yield from relation_ids(item)
+
+
+def _with_titles(prop: Dict[str, Any], titles: Dict[str, str]) -> Dict[str, Any]:
+    """Return a copy of a relation or rollup property with the known related titles attached."""
+    prop_type = prop.get("type")
+    if prop_type == "relation":
+        return dict(prop, relation=[
+            dict(related, title=titles[related.get("id")]) if related.get("id") in titles else related
+            for related in prop.get("relation") or []
+        ])
+    if prop_type == "rollup" and (prop.get("rollup") or {}).get("array"):
+        rollup = prop["rollup"]
+        return dict(prop, rollup=dict(rollup, array=[_with_titles(item, titles) for item in rollup["array"]]))
+    return prop
+
+
+def with_relation_titles(item: Dict[str, Any], fields: Iterable[str], titles: Dict[str, str]) -> Dict[str, Any]:
+    """Return a copy of a page whose requested relation properties carry the related pages' titles.
+
+    The page itself is left untouched, since API responses may be shared
+    between concurrent callers.
+    """
+    properties = item.get("properties", {})
+    resolved = dict(properties)
+    for field in fields:
+        if field in properties:
+            resolved[field] = _with_titles(properties[field], titles)
+    return dict(item, properties=resolved)
+
+
+def format_value(value: Any) -> str:
+    """Format a projected value as short text."""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        # A related page with its resolved title
+        return str(value.get("title") or value.get("id") or "")
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, list):
+        return ", ".join(format_value(v) for v in value)
+    return str(value)
+
+
+def ndjson_line(record: Dict[str, Any]) -> str:
+    """Serialize a record as one line of NDJSON."""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def table_row(record: Dict[str, Any]) -> str:
+    """Serialize a record as one Markdown table row."""
+    cells = (format_value(value).replace("|", "\\|").replace("\n", " ") for value in record.values())
+    return "| " + " | ".join(cells) + " |\n"
+
+
+def table_header(fields: List[str]) -> str:
+    """Return the header rows of a Markdown table with the given columns."""
+    return "| " + " | ".join(fields) + " |\n|" + " --- |" * len(fields) + "\n"
+
+
+def compact_header(fields: List[str], output_format: str) -> str:
+    """Return the text preceding compact records: a table header, or nothing for NDJSON."""
+    return table_header(fields) if output_format == "table" else ""
+
+
+def compact_record(item: Dict[str, Any], fields: List[str], output_format: str) -> str:
+    """Render the requested fields of an item as an NDJSON line or a table row."""
+    record = project(item, fields)
+    return ndjson_line(record) if output_format == "ndjson" else table_row(record)
+
+
+def property_lines(item: Dict[str, Any], fields: List[str]) -> Iterator[str]:
+    """Yield Markdown list items with the typed values of the requested properties."""
+    if item.get("object") == "database":
+        # A database's properties are its schema, not values
+        return
+    properties = item.get("properties", {})
+    for field in fields:
+        if field in BUILTIN_FIELDS or field not in properties:
+            continue
+        yield f"   - {field}: {format_value(property_value(properties[field]))}"
@@ -0,0 +1,191 @@
+"""
+Client-side rate limiting and retries for Notion API calls.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+import httpx
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from src.config import settings
+from src.tools.client import endpoint_name
+from src.tools.metrics import get_metrics
+
+
+logger = logging.getLogger(__name__)
+
+# Request priorities; lower values are served first
+INTERACTIVE = 0
+BULK = 1
+
+# HTTP statuses worth retrying besides 429
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Token bucket scheduler shared by every Notion call.
+
+    Waiting requests are released in priority order, so interactive calls
+    overtake queued bulk traversal. A 429 pauses the whole bucket for the
+    ``Retry-After`` period and halves the rate, which then recovers gradually
+    as requests succeed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        burst: int = 3,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ):
+        """Initialize the bucket with ``burst`` tokens refilled at ``rate`` per second."""
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.rate_limited = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: int = INTERACTIVE) -> None:
+        """Wait until a request may be sent."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1 and time.monotonic() >= self._paused_until:
+            self._tokens -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await waiter
+
+    async def _dispatch(self) -> None:
+        """Release queued requests as tokens become available."""
+        while self._waiters:
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                # The caller was cancelled while queued
+                continue
+            self._tokens -= 1
+            waiter.set_result(None)
+
+    def _backoff(self, attempt: int) -> float:
+        """Return a jittered exponential backoff delay for a retry attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _on_rate_limited(self, retry_after: float) -> None:
+        """Pause the bucket and slow down after a 429."""
+        self.rate_limited += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self._tokens = 0.0
+        self.rate = max(self.max_rate / 8, self.rate / 2)
+
+    def _on_success(self) -> None:
+        """Let the rate recover towards its configured maximum."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        priority: int = INTERACTIVE,
+        **kwargs: Any,
+    ) -> Any:
+        """Call a Notion endpoint through the bucket, retrying transient failures."""
+        metrics = get_metrics()
+        attempt = 0
+        while True:
+            if metrics.enabled:
+                started = time.perf_counter()
+                await self.acquire(priority)
+                metrics.rate_limit_wait.observe(time.perf_counter() - started)
+            else:
+                await self.acquire(priority)
+            try:
+                if metrics.enabled:
+                    with metrics.request(endpoint_name(func)):
+                        result = await func(*args, **kwargs)
+                else:
+                    result = await func(*args, **kwargs)
+                self._on_success()
+                return result
+            except HTTPResponseError as e:
+                if attempt >= self.max_retries:
+                    raise
+                if e.status == 429:
+                    retry_after = _parse_retry_after(e.headers.get("Retry-After"))
+                    self._on_rate_limited(retry_after)
+                    delay = retry_after + random.uniform(0, self.base_delay)
+                elif e.status in RETRYABLE_STATUSES:
+                    delay = self._backoff(attempt)
+                else:
+                    raise
+                logger.warning(f"Notion API returned {e.status}, retrying in {delay:.2f}s")
+            except (RequestTimeoutError, httpx.TransportError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Notion API request failed ({e!r}), retrying in {delay:.2f}s")
+
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    """Parse a ``Retry-After`` header given in seconds, defaulting to one second."""
+    try:
+        return max(0.0, float(value)) if value else 1.0
+    except ValueError:
+        return 1.0
+
+
+# One bucket for the whole process, shared by all concurrent tool calls
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    global _limiter
+
+    if _limiter is None:
+        _limiter = RateLimiter(
+            rate=settings.rate_limit_per_second,
+            burst=settings.rate_limit_burst,
+            max_retries=settings.retry_max_attempts,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+        )
+    return _limiter
@@ -0,0 +1,123 @@
+"""
+Declarative registry of the tools exposed over MCP.
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+from mcp.types import Tool
+
+
+ToolHandler = Callable[..., Awaitable[str]]
+
+
+class ToolArgumentError(ValueError):
+    """Raised when a tool is unknown or called with invalid arguments."""
+
+
+class ToolDefinition:
+    """A tool's MCP description, argument validator and handler."""
+
+    __slots__ = ("name", "tool", "handler", "arguments", "_validator")
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        handler: ToolHandler,
+        arguments: Optional[Dict[str, str]] = None,
+    ):
+        """Build a tool, checking that its handler accepts the schema's properties.
+
+        ``arguments`` maps schema properties to handler keyword names where
+        they differ; other properties are passed under their own name.
+        """
+        self.name = name
+        self.tool = Tool(name=name, description=description, inputSchema=input_schema)
+        self.handler = handler
+        self.arguments = arguments or {}
+        self._validator: Any = None
+
+        # Fail at startup, not on the first call, if schema and handler disagree
+        parameters = inspect.signature(handler).parameters
+        for prop in input_schema.get("properties", {}):
+            if self.arguments.get(prop, prop) not in parameters:
+                raise ValueError(f"Tool '{name}': handler does not accept argument '{prop}'")
+
+    @property
+    def validator(self) -> Any:
+        """Return the argument validator, checking the schema and compiling it on first use.
+
+        Checking a schema against its metaschema takes several milliseconds
+        per tool, so it is kept off the startup path.
+        """
+        if self._validator is None:
+            input_schema = self.tool.inputSchema
+            validator_class = validator_for(input_schema)
+            validator_class.check_schema(input_schema)
+            self._validator = validator_class(input_schema)
+        return self._validator
+
+    async def call(self, arguments: Dict[str, Any]) -> str:
+        """Validate the arguments and run the handler."""
+        error = best_match(self.validator.iter_errors(arguments))
+        if error is not None:
+            path = ".".join(str(part) for part in error.absolute_path)
+            where = f" ({path})" if path else ""
+            raise ToolArgumentError(f"Invalid arguments for {self.name}{where}: {error.message}")
+
+        rename = self.arguments
+        return await self.handler(**{rename.get(key, key): value for key, value in arguments.items()})
+
+
+class ToolRegistry:
+    """Tools registered once at startup and looked up by name.
+
+    ``freeze`` precomputes the ``list_tools`` response, so listing and
+    dispatching cost the same however many tools are registered.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._definitions: Dict[str, ToolDefinition] = {}
+        self._tools: Optional[Tuple[Tool, ...]] = None
+
+    def add(
+        self,
+        name: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        handler: ToolHandler,
+        arguments: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Register a tool."""
+        if self._tools is not None:
+            raise RuntimeError("Tools cannot be added after the registry is frozen")
+        if name in self._definitions:
+            raise ValueError(f"Tool '{name}' is already registered")
+        self._definitions[name] = ToolDefinition(name, description, input_schema, handler, arguments)
+
+    def freeze(self) -> None:
+        """Stop accepting tools and precompute the tool list."""
+        self._tools = tuple(definition.tool for definition in self._definitions.values())
+
+    @property
+    def tools(self) -> Tuple[Tool, ...]:
+        """Return the registered tools in registration order."""
+        if self._tools is None:
+            raise RuntimeError("The registry must be frozen before tools are listed")
+        return self._tools
+
+    def get(self, name: str) -> Optional[ToolDefinition]:
+        """Return the tool registered under ``name``, if any."""
+        return self._definitions.get(name)
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> str:
+        """Dispatch a call to the named tool."""
+        definition = self._definitions.get(name)
+        if definition is None:
+            raise ToolArgumentError(f"Unknown tool: {name}")
+        return await definition.call(arguments)
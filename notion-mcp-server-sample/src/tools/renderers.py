@@ -0,0 +1,218 @@
+"""
+Table-driven renderers for Notion block types.
+"""
+
+from typing import Callable, Dict, List, Tuple
+
+from src.tools.models import Block, extract_rich_text  # noqa: F401 (re-exported)
+
+
+# A renderer gets the block and the indentation prefix
+BlockRenderer = Callable[[Block, str], str]
+
+RENDERERS: Dict[str, BlockRenderer] = {}
+
+# Block types whose renderer also renders their children (table rows)
+SELF_RENDERED_TYPES = frozenset({"table"})
+
+
+def register(*block_types: str) -> Callable[[BlockRenderer], BlockRenderer]:
+    """Register a renderer for one or more block types."""
+    def decorator(renderer: BlockRenderer) -> BlockRenderer:
+        for block_type in block_types:
+            RENDERERS[block_type] = renderer
+        return renderer
+    return decorator
+
+
+def render_block(block: Block, level: int = 0) -> str:
+    """Render a block with the renderer registered for its type."""
+    renderer = RENDERERS.get(block.type)
+    if renderer is None:
+        return f"{'  ' * level}[{block.type.upper()}]"
+    return renderer(block, "  " * level)
+
+
+def render_block_lines(blocks: List[Block], level: int = 0) -> List[str]:
+    """Render a fetched block tree to lines in document order.
+
+    Walks the tree with an explicit stack, so deep trees neither recurse
+    nor copy line lists from level to level.
+    """
+    lines = []
+    stack = [(block, level) for block in reversed(blocks)]
+    while stack:
+        block, block_level = stack.pop()
+        block_text = render_block(block, block_level)
+        if block_text:
+            lines.append(block_text)
+
+        if block.children is not None:
+            if block.type not in SELF_RENDERED_TYPES:
+                stack.extend((child, block_level + 1) for child in reversed(block.children))
+        elif block.children_error is not None:
+            lines.append(f"Error getting blocks: {block.children_error}")
+    return lines
+
+
+def collect_block_text(blocks: List[Block]) -> List[Tuple[str, str]]:
+    """Collect ``(block_id, text)`` pairs for every block of a tree, for indexing."""
+    entries = []
+    stack = list(reversed(blocks))
+    while stack:
+        block = stack.pop()
+        text = render_block(block)
+        if text:
+            entries.append((block.id, text))
+        if block.children and block.type not in SELF_RENDERED_TYPES:
+            stack.extend(reversed(block.children))
+    return entries
+
+
+def count_blocks(blocks: List[Block]) -> int:
+    """Count the blocks of a tree."""
+    count = 0
+    stack = [blocks]
+    while stack:
+        level = stack.pop()
+        count += len(level)
+        stack.extend(block.children for block in level if block.children is not None)
+    return count
+
+
+@register("paragraph")
+def render_paragraph(block: Block, indent: str) -> str:
+    return f"{indent}• {block.text}" if block.text else ""
+
+
+def _prefixed(prefix: str) -> BlockRenderer:
+    """Build a renderer writing the block's rich text after a fixed prefix."""
+    def renderer(block: Block, indent: str) -> str:
+        return indent + prefix + block.text
+    return renderer
+
+
+register("heading_1")(_prefixed("# "))
+register("heading_2")(_prefixed("## "))
+register("heading_3")(_prefixed("### "))
+register("bulleted_list_item")(_prefixed("- "))
+register("numbered_list_item")(_prefixed("1. "))
+register("toggle")(_prefixed("▼ "))
+register("quote")(_prefixed("> "))
+register("template")(_prefixed("[Template] "))
+
+
+@register("to_do")
+def render_to_do(block: Block, indent: str) -> str:
+    checkbox = "[x]" if block.extra else "[ ]"
+    return f"{indent}{checkbox} {block.text}"
+
+
+@register("code")
+def render_code(block: Block, indent: str) -> str:
+    return f"{indent}```{block.extra}\n{block.text}\n{indent}```"
+
+
+@register("divider")
+def render_divider(block: Block, indent: str) -> str:
+    return f"{indent}---"
+
+
+@register("callout")
+def render_callout(block: Block, indent: str) -> str:
+    prefix = f"{block.extra} " if block.extra else ""
+    return f"{indent}> {prefix}{block.text}"
+
+
+@register("equation")
+def render_equation(block: Block, indent: str) -> str:
+    return f"{indent}$$ {block.text} $$"
+
+
+@register("image")
+def render_image(block: Block, indent: str) -> str:
+    return f"{indent}![{block.text}]({block.extra})"
+
+
+def _media(label: str) -> BlockRenderer:
+    """Build a renderer linking to a video, audio, PDF or file block."""
+    def renderer(block: Block, indent: str) -> str:
+        return f"{indent}[{label}: {block.text or label}]({block.extra})"
+    return renderer
+
+
+register("video")(_media("Video"))
+register("audio")(_media("Audio"))
+register("pdf")(_media("PDF"))
+register("file")(_media("File"))
+
+
+def _link(label: str) -> BlockRenderer:
+    """Build a renderer for blocks that point at a URL."""
+    def renderer(block: Block, indent: str) -> str:
+        return f"{indent}[{label}: {block.text or block.extra}]({block.extra})"
+    return renderer
+
+
+register("bookmark")(_link("Bookmark"))
+register("embed")(_link("Embed"))
+register("link_preview")(_link("Link preview"))
+
+
+@register("child_page")
+def render_child_page(block: Block, indent: str) -> str:
+    return f"{indent}[Child page] {block.text} ({block.id})"
+
+
+@register("child_database")
+def render_child_database(block: Block, indent: str) -> str:
+    return f"{indent}[Child database] {block.text} ({block.id})"
+
+
+@register("link_to_page")
+def render_link_to_page(block: Block, indent: str) -> str:
+    return f"{indent}→ Link to {block.extra.replace('_id', '')} {block.text}"
+
+
+@register("table_row")
+def render_table_row(block: Block, indent: str) -> str:
+    cells = [cell.replace("|", "\\|") for cell in block.extra]
+    return f"{indent}| " + " | ".join(cells) + " |"
+
+
+@register("table")
+def render_table(block: Block, indent: str) -> str:
+    """Render a table and its rows (fetched as the table's children) as Markdown."""
+    rows = [row for row in block.children or () if row.type == "table_row"]
+    if not rows:
+        return f"{indent}[Table]"
+
+    lines = []
+    for row in rows:
+        lines.append(render_table_row(row, indent))
+        if len(lines) == 1:
+            # Markdown tables always need a header row
+            width = block.extra or len(row.extra)
+            lines.append(f"{indent}|" + " --- |" * width)
+    return "\n".join(lines)
+
+
+@register("column_list", "column", "synced_block")
+def render_container(block: Block, indent: str) -> str:
+    """Layout and synced blocks render nothing themselves; their children carry the content."""
+    return ""
+
+
+@register("table_of_contents")
+def render_table_of_contents(block: Block, indent: str) -> str:
+    return f"{indent}[Table of contents]"
+
+
+@register("breadcrumb")
+def render_breadcrumb(block: Block, indent: str) -> str:
+    return f"{indent}[Breadcrumb]"
+
+
+@register("unsupported")
+def render_unsupported(block: Block, indent: str) -> str:
+    return f"{indent}[Unsupported block]"
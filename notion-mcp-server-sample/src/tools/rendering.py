@@ -0,0 +1,38 @@
+"""
+Output assembly helpers for tool responses.
+"""
+
+from typing import Iterable, List
+
+
+class TextWriter:
+    """Collect output chunks and join them once at the end.
+
+    Appending to a list keeps building a response linear in its size, where
+    repeated string concatenation copies the whole response on every append.
+    """
+
+    __slots__ = ("_parts", "size")
+
+    def __init__(self):
+        """Initialize an empty writer."""
+        self._parts: List[str] = []
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        """Append a chunk of text."""
+        self._parts.append(text)
+        self.size += len(text)
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Append several chunks, each followed by a newline."""
+        for line in lines:
+            self._parts.append(line)
+            self._parts.append("\n")
+            self.size += len(line) + 1
+
+    def getvalue(self, header: str = "") -> str:
+        """Return the collected text, optionally preceded by ``header``."""
+        if header:
+            return "".join([header, *self._parts])
+        return "".join(self._parts)
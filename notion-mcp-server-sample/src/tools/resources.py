@@ -0,0 +1,193 @@
+"""
+Notion pages and databases exposed as MCP resources, with change subscriptions.
+"""
+
+import asyncio
+import logging
+import re
+import weakref
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import AnyUrl
+
+from src.config import settings
+from src.tools.budget import text_digest
+from src.tools.cache import make_key
+from src.tools.notion_tools import NotionTools
+from src.tools.pagination import paginate
+from src.tools.rate_limit import BULK, INTERACTIVE
+
+
+logger = logging.getLogger(__name__)
+
+PAGE_TEMPLATE = "notion://page/{id}"
+DATABASE_TEMPLATE = "notion://database/{id}"
+MIME_TYPE = "text/markdown"
+
+# Rows rendered for a database resource
+DATABASE_ROWS = 1000
+
+# JSON-RPC error code of unknown resources (MCP specification)
+RESOURCE_NOT_FOUND = -32002
+
+URI_PATTERN = re.compile(r"notion://(page|database)/([0-9a-fA-F-]{32,36})")
+
+
+class ResourceError(Exception):
+    """Raised for resource URIs the server does not serve."""
+
+
+def parse_uri(uri: str) -> Tuple[str, str]:
+    """Split a resource URI into its kind (``page`` or ``database``) and Notion ID."""
+    match = URI_PATTERN.fullmatch(uri)
+    if not match:
+        raise ResourceError(f"Unknown resource: {uri}")
+    return match.group(1), match.group(2)
+
+
+class NotionResources:
+    """Serve pages and databases as resources and notify subscribers when they change.
+
+    Every resource has a version: a page's ``last_edited_time``, or for a
+    database a digest of the rows it shows (see ``_database_version``). Subscribed
+    resources are checked every ``poll_interval`` seconds, with one check
+    each however many sessions watch them, and subscribers are notified only
+    when the version moved. Sessions are held weakly, so closed sessions
+    drop out of the subscriptions.
+    """
+
+    def __init__(self, tools: NotionTools, poll_interval: float = 60.0):
+        """Initialize with no subscriptions; the watcher starts with the first one."""
+        self.tools = tools
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[str, "weakref.WeakSet[Any]"] = {}
+        # Last version seen of each subscribed resource
+        self._versions: Dict[str, str] = {}
+        self._watcher: Optional["asyncio.Future[None]"] = None
+
+    async def read(self, uri: str) -> Tuple[str, str]:
+        """Return the rendered content of a resource and its version."""
+        kind, item_id = parse_uri(uri)
+        self.tools._check_client()
+        if kind == "page":
+            page = await self.tools._retrieve_page(item_id)
+            return await self.tools._render_page_content(item_id), page.last_edited_time
+
+        cache_key = make_key("resource", uri=uri)
+        cached = self.tools.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # The text and the version are built from the same pass over the rows
+        database = await self.tools._request(self.tools.client.databases.retrieve, item_id)
+        stamps: List[str] = []
+        text = await self.tools._render_database_pages(item_id, self._database_rows(item_id, stamps))
+        result = text, _database_version(database, stamps)
+        self.tools.cache.set(cache_key, result, ttl=settings.cache_database_ttl)
+        return result
+
+    async def subscribe(self, uri: str, session: Any) -> None:
+        """Notify ``session`` when the resource changes."""
+        parse_uri(uri)
+        self.tools._check_client()
+        if uri not in self._versions:
+            self._versions[uri] = await self._probe(uri)
+        self._subscribers.setdefault(uri, weakref.WeakSet()).add(session)
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.ensure_future(self._watch())
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        """Stop notifying ``session`` of changes to the resource."""
+        subscribers = self._subscribers.get(uri)
+        if subscribers is not None:
+            subscribers.discard(session)
+        self._prune()
+
+    def close(self) -> None:
+        """Stop the watcher."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    def _prune(self) -> List[str]:
+        """Forget resources nobody watches; return the watched ones."""
+        for uri in [uri for uri, subscribers in self._subscribers.items() if not subscribers]:
+            del self._subscribers[uri]
+            self._versions.pop(uri, None)
+        return list(self._subscribers)
+
+    async def _watch(self) -> None:
+        """Check the subscribed resources periodically while any are watched."""
+        while self._prune():
+            await asyncio.sleep(self.poll_interval)
+            await self.check()
+
+    async def check(self) -> int:
+        """Check every subscribed resource once; return the number that changed."""
+        uris = self._prune()
+        versions = await asyncio.gather(*(self._probe(uri) for uri in uris), return_exceptions=True)
+
+        changed = 0
+        for uri, version in zip(uris, versions):
+            if isinstance(version, BaseException):
+                logger.warning(f"Could not check resource {uri}: {version}")
+                continue
+            if uri not in self._versions or version == self._versions[uri]:
+                continue
+            self._versions[uri] = version
+            changed += 1
+            logger.info(f"Resource {uri} changed (version {version})")
+            for session in list(self._subscribers.get(uri, ())):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception as e:
+                    # The client went away; its session is dropped with it
+                    logger.debug(f"Could not notify a subscriber of {uri}: {e}")
+                    self._subscribers[uri].discard(session)
+        return changed
+
+    async def _probe(self, uri: str) -> str:
+        """Fetch the current version of a resource."""
+        kind, item_id = parse_uri(uri)
+        if kind == "database":
+            database = await self.tools._request(self.tools.client.databases.retrieve, item_id, priority=BULK)
+            stamps: List[str] = []
+            async for _ in self._database_rows(item_id, stamps, priority=BULK):
+                pass
+            version = _database_version(database, stamps)
+            if uri in self._versions and version != self._versions[uri]:
+                self.tools.cache.invalidate(make_key("resource", uri=uri))
+            return version
+
+        page = await self.tools._request(self.tools.client.pages.retrieve, item_id, priority=BULK)
+        version = page["last_edited_time"]
+        if uri in self._versions and version != self._versions[uri]:
+            # Make the next read render the new version
+            self.tools.cache.invalidate(make_key("pages.retrieve", page_id=item_id))
+            if self.tools.store:
+                await self.tools.store.save_page(page)
+        return version
+
+    async def _database_rows(
+        self, database_id: str, stamps: List[str], priority: int = INTERACTIVE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the rows a database resource shows, recording their ID and edit time in ``stamps``."""
+        query = partial(self.tools._request, self.tools.client.databases.query, priority=priority)
+        async for page in paginate(query, limit=DATABASE_ROWS, database_id=database_id):
+            stamps.append(f"{page['id']}@{page['last_edited_time']}")
+            yield page
+
+
+def _database_version(database: Dict[str, Any], stamps: List[str]) -> str:
+    """Return the version of a database resource: ``<newest row edit time>#<checksum>``.
+
+    The checksum covers the database's own edit time (schema changes) and
+    the ID and edit time of every row the resource shows, so archived,
+    removed and added rows change the version even when they are not the
+    most recently edited.
+    """
+    newest = max((stamp.rsplit("@", 1)[1] for stamp in stamps), default="")
+    checksum = text_digest(" ".join([database.get("last_edited_time", "")] + stamps))
+    return f"{newest}#{checksum:08x}"
+
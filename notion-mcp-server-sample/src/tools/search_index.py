@@ -0,0 +1,136 @@
+"""
+Full-text index over mirrored Notion content.
+"""
+
+import logging
+import re
+import sqlite3
+from typing import Any, Dict, List, Tuple
+
+from src.tools.store import PageStore, normalize_id
+
+
+logger = logging.getLogger(__name__)
+
+
+# Indexed rows live in a plain table; the FTS5 table indexes them as external
+# content and is kept in sync by triggers, so a page can be replaced with one
+# indexed DELETE instead of a scan of the full-text table.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS indexed_blocks (
+    rowid INTEGER PRIMARY KEY,
+    page_id TEXT NOT NULL,
+    block_id TEXT NOT NULL,
+    page_title TEXT NOT NULL,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS indexed_blocks_page ON indexed_blocks (page_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS block_search USING fts5(
+    title,
+    text,
+    content = 'indexed_blocks',
+    content_rowid = 'rowid',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS indexed_blocks_insert AFTER INSERT ON indexed_blocks BEGIN
+    INSERT INTO block_search (rowid, title, text) VALUES (new.rowid, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS indexed_blocks_delete AFTER DELETE ON indexed_blocks BEGIN
+    INSERT INTO block_search (block_search, rowid, title, text)
+    VALUES ('delete', old.rowid, old.title, old.text);
+END;
+"""
+
+# Title matches weigh more than body matches in the BM25 ranking
+TITLE_WEIGHT = 5.0
+TEXT_WEIGHT = 1.0
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words.
+
+    Each word is quoted so punctuation and FTS5 operators in user input are
+    taken literally; the last word also matches as a prefix.
+    """
+    tokens = TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """BM25-ranked full-text index of page titles and block text.
+
+    The index is stored next to the mirrored pages in the page store and is
+    updated one page at a time, whenever a page's block tree is refetched.
+    """
+
+    def __init__(self, store: PageStore):
+        """Initialize the index inside ``store``."""
+        self.store = store
+        self._ready = False
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        """Create the index tables on first use."""
+        if not self._ready:
+            conn.executescript(SCHEMA)
+            self._ready = True
+
+    async def update_page(self, page_id: str, title: str, blocks: List[Tuple[str, str]]) -> None:
+        """Replace the indexed content of a page with its title and ``(block_id, text)`` pairs."""
+        await self.store.execute(self._update_page, normalize_id(page_id), title, blocks)
+
+    def _update_page(
+        self, conn: sqlite3.Connection, page_id: str, title: str, blocks: List[Tuple[str, str]]
+    ) -> None:
+        self._ensure_schema(conn)
+        rows = [(page_id, "", title, title, "")]
+        rows.extend((page_id, block_id, title, "", text) for block_id, text in blocks if text)
+        with conn:
+            conn.execute("DELETE FROM indexed_blocks WHERE page_id = ?", (page_id,))
+            conn.executemany(
+                "INSERT INTO indexed_blocks (page_id, block_id, page_title, title, text) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the best matching pages and blocks for a free-text query."""
+        match_query = build_match_query(query)
+        if not match_query:
+            return []
+        return await self.store.execute(self._search, match_query, limit)
+
+    def _search(self, conn: sqlite3.Connection, match_query: str, limit: int) -> List[Dict[str, Any]]:
+        self._ensure_schema(conn)
+        rows = conn.execute(
+            "SELECT b.page_id, b.block_id, b.page_title, "
+            "snippet(block_search, -1, '**', '**', '...', 16), "
+            f"bm25(block_search, {TITLE_WEIGHT}, {TEXT_WEIGHT}) AS score "
+            "FROM block_search JOIN indexed_blocks b ON b.rowid = block_search.rowid "
+            "WHERE block_search MATCH ? ORDER BY score LIMIT ?",
+            (match_query, limit),
+        ).fetchall()
+        return [
+            {
+                "page_id": page_id,
+                "block_id": block_id or None,
+                "page_title": page_title,
+                "snippet": snippet,
+                "score": -score,
+            }
+            for page_id, block_id, page_title, snippet, score in rows
+        ]
+
+    async def page_count(self) -> int:
+        """Return the number of indexed pages."""
+        return await self.store.execute(self._page_count)
+
+    def _page_count(self, conn: sqlite3.Connection) -> int:
+        self._ensure_schema(conn)
+        return conn.execute("SELECT COUNT(*) FROM indexed_blocks WHERE block_id = ''").fetchone()[0]
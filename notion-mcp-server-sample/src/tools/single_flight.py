@@ -0,0 +1,42 @@
+"""
+Single-flight deduplication of concurrent identical requests.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def _consume_result(future: "asyncio.Future[Any]") -> None:
+    """Retrieve the outcome of a flight so an unobserved error is not reported."""
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """Share one in-flight call between all concurrent callers with the same key.
+
+    Only calls that overlap in time are merged; once a call finishes its
+    key is forgotten and the next caller starts a new one.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self.shared = 0
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` for ``key``, or join the call already in flight."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.shared += 1
+        else:
+            flight = asyncio.ensure_future(func())
+            self._flights[key] = flight
+            flight.add_done_callback(_consume_result)
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+
+        # A cancelled caller must not cancel the call for everyone else
+        return await asyncio.shield(flight)
@@ -0,0 +1,236 @@
+"""
+Persistent SQLite store for Notion pages and block trees.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.tools.models import Block, blocks_from_rows
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    last_edited_time TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS block_trees (
+    page_id TEXT NOT NULL,
+    include_children INTEGER NOT NULL,
+    last_edited_time TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (page_id, include_children)
+);
+CREATE TABLE IF NOT EXISTS sync_checkpoints (
+    scope TEXT PRIMARY KEY,
+    last_edited_time TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_pages (
+    scope TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    PRIMARY KEY (scope, page_id)
+);
+"""
+
+
+def normalize_id(notion_id: str) -> str:
+    """Normalize a Notion ID so hyphenated and compact forms share one key."""
+    return notion_id.replace("-", "").lower()
+
+
+class PageStore:
+    """SQLite-backed store of page objects and fetched block trees.
+
+    All database work runs on a single background thread, which keeps the
+    event loop free and serializes access to the connection.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the store at ``path``."""
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-store")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection, creating the schema on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            logger.info(f"Opened page store at {self.path}")
+        return self._conn
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking store operation on the store thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def execute(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(connection, *args)`` on the store thread.
+
+        Lets other components keep their own tables in the same database.
+        """
+        return await self._run(lambda: func(self._connect(), *args))
+
+    async def get_page(
+        self,
+        page_id: str,
+        max_age: Optional[float] = None,
+        sync_max_age: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a stored page object, or None if missing or stale.
+
+        A page is fresh if it was fetched within ``max_age`` seconds, or if a
+        sync scope covering it completed a pass within ``sync_max_age`` seconds.
+        Without a ``max_age`` any stored page is returned.
+        """
+        return await self._run(self._get_page, normalize_id(page_id), max_age, sync_max_age)
+
+    def _get_page(
+        self, page_id: str, max_age: Optional[float], sync_max_age: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT p.fetched_at, p.data, "
+            "(SELECT MAX(c.synced_at) FROM sync_pages s "
+            "JOIN sync_checkpoints c ON c.scope = s.scope WHERE s.page_id = p.page_id) "
+            "FROM pages p WHERE p.page_id = ?",
+            (page_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        fetched_at, data, synced_at = row
+        if max_age is not None:
+            now = time.time()
+            fresh = now - fetched_at <= max_age
+            if not fresh and sync_max_age is not None and synced_at is not None:
+                fresh = now - synced_at <= sync_max_age
+            if not fresh:
+                return None
+        return json.loads(data)
+
+    async def save_page(self, page: Dict[str, Any]) -> None:
+        """Store a page object."""
+        await self._run(self._save_page, page)
+
+    def _save_page(self, page: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (page_id, last_edited_time, fetched_at, data) "
+                "VALUES (?, ?, ?, ?)",
+                (normalize_id(page["id"]), page["last_edited_time"], time.time(), json.dumps(page)),
+            )
+
+    async def get_block_tree(
+        self, page_id: str, include_children: bool
+    ) -> Optional[Tuple[str, List[Block]]]:
+        """Return ``(last_edited_time, blocks)`` for a stored block tree."""
+        return await self._run(self._get_block_tree, normalize_id(page_id), include_children)
+
+    def _get_block_tree(
+        self, page_id: str, include_children: bool
+    ) -> Optional[Tuple[str, List[Block]]]:
+        row = self._connect().execute(
+            "SELECT last_edited_time, data FROM block_trees "
+            "WHERE page_id = ? AND include_children = ?",
+            (page_id, int(include_children)),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], blocks_from_rows(json.loads(row[1]))
+
+    async def save_block_tree(
+        self,
+        page_id: str,
+        include_children: bool,
+        last_edited_time: str,
+        blocks: List[Block],
+    ) -> None:
+        """Store the block tree of a page at a given edit time."""
+        await self._run(
+            self._save_block_tree, normalize_id(page_id), include_children, last_edited_time, blocks
+        )
+
+    def _save_block_tree(
+        self,
+        page_id: str,
+        include_children: bool,
+        last_edited_time: str,
+        blocks: List[Block],
+    ) -> None:
+        data = json.dumps([block.to_row() for block in blocks], separators=(",", ":"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO block_trees (page_id, include_children, last_edited_time, data) "
+                "VALUES (?, ?, ?, ?)",
+                (page_id, int(include_children), last_edited_time, data),
+            )
+
+    async def get_block_tree_version(self, page_id: str, include_children: bool = True) -> Optional[str]:
+        """Return the ``last_edited_time`` of a stored block tree without loading it."""
+        return await self._run(self._get_block_tree_version, normalize_id(page_id), include_children)
+
+    def _get_block_tree_version(self, page_id: str, include_children: bool) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT last_edited_time FROM block_trees WHERE page_id = ? AND include_children = ?",
+            (page_id, int(include_children)),
+        ).fetchone()
+        return row[0] if row else None
+
+    async def get_block_tree_ids(self) -> List[str]:
+        """Return the IDs of all pages with a stored recursive block tree."""
+        return await self._run(self._get_block_tree_ids)
+
+    def _get_block_tree_ids(self) -> List[str]:
+        rows = self._connect().execute("SELECT page_id FROM block_trees WHERE include_children = 1")
+        return [row[0] for row in rows]
+
+    async def get_checkpoint(self, scope: str) -> Optional[str]:
+        """Return the newest ``last_edited_time`` synced for a scope."""
+        return await self._run(self._get_checkpoint, scope)
+
+    def _get_checkpoint(self, scope: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT last_edited_time FROM sync_checkpoints WHERE scope = ?", (scope,)
+        ).fetchone()
+        return row[0] if row else None
+
+    async def save_checkpoint(
+        self, scope: str, last_edited_time: Optional[str], synced_at: float, page_ids: List[str]
+    ) -> None:
+        """Record a completed sync pass and the pages it covered."""
+        await self._run(self._save_checkpoint, scope, last_edited_time, synced_at, page_ids)
+
+    def _save_checkpoint(
+        self, scope: str, last_edited_time: Optional[str], synced_at: float, page_ids: List[str]
+    ) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO sync_pages (scope, page_id) VALUES (?, ?)",
+                [(scope, normalize_id(page_id)) for page_id in page_ids],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_checkpoints (scope, last_edited_time, synced_at) "
+                "VALUES (?, ?, ?)",
+                (scope, last_edited_time, synced_at),
+            )
+
+    async def close(self) -> None:
+        """Close the database connection and stop the store thread."""
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
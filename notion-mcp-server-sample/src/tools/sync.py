@@ -0,0 +1,262 @@
+"""
+Incremental sync of Notion content into the local page store.
+"""
+
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import httpx
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from src.config import settings
+from src.tools.cache import make_key
+from src.tools.models import Page
+from src.tools.notion_tools import NotionTools
+from src.tools.pagination import paginate
+from src.tools.rate_limit import BULK
+from src.tools.rendering import TextWriter
+from src.tools.store import normalize_id
+
+
+logger = logging.getLogger(__name__)
+
+# Guard against parent cycles when resolving page ancestry
+MAX_ANCESTRY_DEPTH = 64
+
+# Sort used to walk pages from the most recently edited backwards
+NEWEST_FIRST = {"timestamp": "last_edited_time", "direction": "descending"}
+
+
+def parse_scopes(value: str) -> List[str]:
+    """Parse a comma-separated list of sync scopes."""
+    scopes = []
+    for scope in (part.strip() for part in value.split(",")):
+        if not scope:
+            continue
+        kind, _, target = scope.partition(":")
+        if kind == "workspace" and not target:
+            scopes.append(kind)
+        elif kind in ("database", "page") and target:
+            scopes.append(f"{kind}:{target}")
+        else:
+            raise ValueError(
+                f"Invalid sync scope '{scope}'. Use 'workspace', 'database:<id>' or 'page:<id>'."
+            )
+    return scopes
+
+
+class WorkspaceSync:
+    """Keep the page store mirroring selected parts of a Notion workspace.
+
+    Each scope is polled newest-edit-first and the walk stops at the scope's
+    checkpoint, so a pass only costs the listing of recently edited pages plus
+    a block tree fetch for each page that actually changed. A scope is one of:
+
+    - ``workspace``: every page shared with the integration
+    - ``database:<id>``: the rows of one database
+    - ``page:<id>``: a page and every page nested below it
+    """
+
+    def __init__(self, tools: NotionTools, scopes: List[str]):
+        """Initialize the sync engine for the given scopes."""
+        if not tools.store:
+            raise ValueError("Workspace sync requires a page store (set PAGE_STORE_PATH)")
+        self.tools = tools
+        self.store = tools.store
+        self.scopes = scopes
+        self.last_results: Dict[str, Dict[str, int]] = {}
+        self._lock = asyncio.Lock()
+
+    async def sync(self) -> Dict[str, Dict[str, int]]:
+        """Run one pass over every scope. Concurrent passes are serialized."""
+        self.tools._check_client()
+
+        async with self._lock:
+            results = {}
+            for scope in self.scopes:
+                results[scope] = await self.sync_scope(scope)
+            self.last_results = results
+            return results
+
+    async def sync_scope(self, scope: str) -> Dict[str, int]:
+        """Refetch the pages of a scope edited since its last checkpoint."""
+        started = time.time()
+        checkpoint = await self.store.get_checkpoint(scope)
+        newest = checkpoint
+        stats = {"checked": 0, "refetched": 0, "truncated": 0, "failed": 0}
+        page_ids: List[str] = []
+        ancestry: Dict[str, bool] = {}
+        semaphore = asyncio.Semaphore(settings.sync_concurrency)
+        tasks = []
+
+        pages = self._pages_newest_first(scope, checkpoint)
+        try:
+            async for page in pages:
+                edited = page["last_edited_time"]
+                # Edit times are rounded to the minute, so pages at the checkpoint are re-checked
+                if checkpoint and edited < checkpoint:
+                    break
+                if not await self._in_scope(scope, page, ancestry):
+                    continue
+
+                stats["checked"] += 1
+                page_ids.append(page["id"])
+                if newest is None or edited > newest:
+                    newest = edited
+
+                if await self.store.get_block_tree_version(page["id"]) == edited:
+                    continue
+
+                await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(self._refresh_page(page, stats, semaphore)))
+        finally:
+            await pages.aclose()
+            await asyncio.gather(*tasks)
+
+        if stats["failed"]:
+            # Keep the old checkpoint so failed pages are picked up by the next pass
+            logger.warning(f"Sync of {scope} had {stats['failed']} failure(s); checkpoint not advanced")
+        else:
+            await self.store.save_checkpoint(scope, newest, started, page_ids)
+
+        logger.info(
+            f"Synced {scope}: {stats['checked']} checked, {stats['refetched']} refetched, "
+            f"{stats['truncated']} truncated, {stats['failed']} failed in {time.time() - started:.2f}s"
+        )
+        return stats
+
+    def _pages_newest_first(
+        self, scope: str, checkpoint: Optional[str]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Iterate the pages of a scope from the most recently edited."""
+        client = self.tools.client
+        kind, _, target = scope.partition(":")
+
+        if kind == "database":
+            query = partial(self.tools._request, client.databases.query, priority=BULK)
+            query_params: Dict[str, Any] = {"database_id": target, "sorts": [NEWEST_FIRST]}
+            if checkpoint:
+                query_params["filter"] = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": checkpoint},
+                }
+            return paginate(query, **query_params)
+
+        search = partial(self.tools._request, client.search, priority=BULK)
+        return paginate(search, filter={"property": "object", "value": "page"}, sort=NEWEST_FIRST)
+
+    async def _in_scope(self, scope: str, page: Dict[str, Any], ancestry: Dict[str, bool]) -> bool:
+        """Check whether a page belongs to a scope."""
+        kind, _, target = scope.partition(":")
+        if kind != "page":
+            return True
+        return await self._is_descendant(page, normalize_id(target), ancestry)
+
+    async def _is_descendant(self, page: Dict[str, Any], root_id: str, ancestry: Dict[str, bool]) -> bool:
+        """Walk up the parents of a page to find out if it lives under ``root_id``.
+
+        Answers are memoized in ``ancestry`` for every object on the walked
+        chain, so siblings resolve without further requests.
+        """
+        chain = []
+        current: Optional[Dict[str, Any]] = page
+        result = False
+
+        for _ in range(MAX_ANCESTRY_DEPTH):
+            if current is None:
+                break
+            node_id = normalize_id(current["id"])
+            if node_id == root_id:
+                result = True
+                break
+            if node_id in ancestry:
+                result = ancestry[node_id]
+                break
+            chain.append(node_id)
+            current = await self._get_parent(current.get("parent") or {})
+
+        for node_id in chain:
+            ancestry[node_id] = result
+        return result
+
+    async def _get_parent(self, parent: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Retrieve the page, database or block referenced by a parent object."""
+        client = self.tools.client
+        parent_type = parent.get("type")
+
+        try:
+            if parent_type == "page_id":
+                stored = await self.store.get_page(parent["page_id"])
+                if stored is not None:
+                    return stored
+                return await self.tools._request(client.pages.retrieve, parent["page_id"], priority=BULK)
+            if parent_type == "database_id":
+                return await self.tools._request(
+                    client.databases.retrieve, parent["database_id"], priority=BULK
+                )
+            if parent_type == "block_id":
+                return await self.tools._request(client.blocks.retrieve, parent["block_id"], priority=BULK)
+        except HTTPResponseError as e:
+            # Parents not shared with the integration end the walk
+            logger.debug(f"Could not resolve parent {parent}: {e}")
+        return None
+
+    async def _refresh_page(
+        self, page: Dict[str, Any], stats: Dict[str, int], semaphore: asyncio.Semaphore
+    ) -> None:
+        """Refetch the block tree of a changed page and store it with the page."""
+        try:
+            fetcher = self.tools._new_block_fetcher(priority=BULK)
+            blocks = await fetcher.fetch(page["id"])
+            if fetcher.errors:
+                stats["failed"] += 1
+                return
+
+            await self.store.save_page(page)
+            if fetcher.truncated:
+                # Like get_page_content, don't mirror partial trees: reads fetch the page live
+                logger.warning(
+                    f"Page {page['id']} exceeds the block fetch limits; its content is not mirrored"
+                )
+                self.tools.cache.invalidate(make_key("pages.retrieve", page_id=page["id"]))
+                stats["truncated"] += 1
+                return
+
+            await self.tools._persist_block_tree(Page.from_api(page), True, blocks)
+            self.tools.cache.invalidate(make_key("pages.retrieve", page_id=page["id"]))
+            stats["refetched"] += 1
+        except (HTTPResponseError, RequestTimeoutError, httpx.TransportError) as e:
+            logger.error(f"Error syncing page {page['id']}: {e}")
+            stats["failed"] += 1
+        finally:
+            semaphore.release()
+
+    async def run_periodically(self, interval: float) -> None:
+        """Run sync passes forever, ``interval`` seconds apart."""
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Sync pass failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def sync_workspace(self) -> str:
+        """Run a sync pass and describe what changed."""
+        try:
+            results = await self.sync()
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return f"Unexpected error: {e}"
+
+        output = TextWriter()
+        output.write("Sync completed:\n\n")
+        for scope, stats in results.items():
+            output.write(
+                f"- {scope}: {stats['checked']} page(s) checked, "
+                f"{stats['refetched']} refetched, {stats['truncated']} too large to mirror, "
+                f"{stats['failed']} failed\n"
+            )
+        return output.getvalue()